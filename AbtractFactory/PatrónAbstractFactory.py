@@ -1,12 +1,64 @@
+import argparse  # Permite indicar la base de datos desde la línea de comandos
+import bisect  # Índice ordenado por presupuesto para consultas por rango
+import csv  # Importación masiva desde archivos CSV
+import itertools  # Paginación perezosa de los listados
+import math  # Validación de presupuestos finitos
+import sqlite3  # Persistencia local del registro
+import sys  # Salida estándar para exportar listados
+import time  # Medición de tiempos en el benchmark
+import tracemalloc  # Medición de memoria en el benchmark
+import weakref  # Enlace de cada institución con el registro que la guarda
 from abc import ABC, abstractmethod  # Importa clases para crear interfaces abstractas
 
 
 # Abstract Product
 
+# Instituciones guardadas en un RegistroInstituciones: id(institución) -> (referencia débil al
+# registro, id en el registro). El enlace vive aquí y no en cada institución para no sumarle
+# campos; el registro mantiene vivas sus instituciones y borra sus enlaces al cerrarse.
+_ENLACES = {}
+
 class Institucion(ABC):  # Clase abstracta que define una institución
+    # Sin __dict__ por instancia: ocupa mucho menos memoria
+    __slots__ = ("_nombre", "_presupuesto")
+
     def __init__(self, nombre, presupuesto):
-        self.nombre = nombre  # Nombre de la institución
-        self.presupuesto = presupuesto  # Presupuesto de la institución
+        self._nombre = nombre  # Nombre de la institución
+        self._presupuesto = presupuesto  # Presupuesto de la institución
+
+    @property
+    def nombre(self):
+        return self._nombre
+
+    @nombre.setter
+    def nombre(self, valor):
+        # Si está registrada, el cambio pasa por el registro (base de datos e índices)
+        enlace = _ENLACES.get(id(self))
+        if enlace is not None:
+            enlace[0]().actualizar(enlace[1], nombre=valor)
+        else:
+            self._nombre = valor
+
+    @property
+    def presupuesto(self):
+        return self._presupuesto
+
+    @presupuesto.setter
+    def presupuesto(self, valor):
+        enlace = _ENLACES.get(id(self))
+        if enlace is not None:
+            enlace[0]().actualizar(enlace[1], presupuesto=valor)
+        else:
+            self._presupuesto = valor
+
+    @property
+    def descripcion(self):
+        # Resultado de describir(); si está registrada, el registro la guarda mientras no
+        # cambien nombre ni presupuesto
+        enlace = _ENLACES.get(id(self))
+        if enlace is None:
+            return self.describir()
+        return enlace[0]().descripcion(enlace[1])
 
     @abstractmethod
     def describir(self):  # Método que debe ser implementado por las subclases
@@ -16,16 +68,31 @@ class Institucion(ABC):  # Clase abstracta que define una institución
 # Concrete Products
 
 class InstitucionPublica(Institucion):  # Implementación concreta de una institución pública
+    __slots__ = ()
+
     def describir(self):
         # Devuelve una descripción específica para instituciones públicas
         return f"[PÚBLICA] {self.nombre} - Presupuesto estatal: ${self.presupuesto} millones"
 
 class InstitucionPrivada(Institucion):  # Implementación concreta de una institución privada
+    __slots__ = ()
+
     def describir(self):
         # Devuelve una descripción específica para instituciones privadas
         return f"[PRIVADA] {self.nombre} - Presupuesto propio: ${self.presupuesto} millones"
 
 
+def convertir_presupuesto(valor):
+    # Convierte el presupuesto a número (entero si no tiene decimales); lanza ValueError si no es válido
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        numero = float(valor)
+    else:
+        numero = float(str(valor).strip().replace(",", "."))
+    if not math.isfinite(numero) or numero < 0:  # Descarta NaN e infinito
+        raise ValueError("El presupuesto debe ser un número positivo")
+    return int(numero) if numero.is_integer() else numero
+
+
 # Abstract Factory
 
 class FabricaInstitucion(ABC):  # Interfaz abstracta para la fábrica de instituciones
@@ -33,6 +100,16 @@ class FabricaInstitucion(ABC):  # Interfaz abstracta para la fábrica de institu
     def crear_institucion(self, nombre, presupuesto):  # Método a implementar por cada fábrica concreta
         pass
 
+    def crear_lote(self, filas):
+        # Crea muchas instituciones a partir de pares (nombre, presupuesto), convirtiendo cada presupuesto una vez
+        crear = self.crear_institucion
+        return [crear(nombre, convertir_presupuesto(presupuesto)) for nombre, presupuesto in filas]
+
+    def crear_lote_csv(self, ruta):
+        # Igual que crear_lote, leyendo un CSV con las columnas nombre y presupuesto
+        with open(ruta, "r", encoding="utf-8", newline="") as archivo:
+            return self.crear_lote((fila["nombre"], fila["presupuesto"]) for fila in csv.DictReader(archivo))
+
 
 # Concrete Factories
 
@@ -45,10 +122,245 @@ class FabricaPrivada(FabricaInstitucion):  # Fábrica concreta para institucione
         return InstitucionPrivada(nombre, presupuesto)  # Crea y retorna una institución privada
 
 
+# Registro de instituciones
+# Guarda las instituciones en SQLite (o en memoria) y mantiene índices en memoria:
+# por nombre y por tipo (diccionarios) y por presupuesto (listas ordenadas), de modo
+# que las búsquedas y las consultas por rango no recorren todo el registro.
+
+FABRICAS = {"publica": FabricaPublica(), "privada": FabricaPrivada()}  # Una fábrica por tipo, reutilizable
+TIPOS = {InstitucionPublica: "publica", InstitucionPrivada: "privada"}  # Tipo de cada producto concreto
+
+class RegistroInstituciones:
+    def __init__(self, ruta=":memory:"):
+        self.conexion = sqlite3.connect(ruta)
+        self.conexion.execute(
+            "CREATE TABLE IF NOT EXISTS instituciones ("
+            "id INTEGER PRIMARY KEY, tipo TEXT NOT NULL, nombre TEXT NOT NULL, presupuesto REAL NOT NULL)")
+        self._instituciones = {}  # id -> institución
+        self._por_nombre = {}  # nombre en minúsculas -> lista de ids
+        self._por_tipo = {tipo: [] for tipo in FABRICAS}  # tipo -> lista de ids
+        self._presupuestos = {tipo: [] for tipo in FABRICAS}  # tipo -> lista ordenada de (presupuesto, id)
+        self._descripciones = {}  # id -> descripción ya renderizada (se calcula al pedirla)
+        self._referencia = weakref.ref(self)
+        # Al cerrar el registro (o si se libera sin cerrarlo) se borran los enlaces de sus instituciones
+        self._desenlazar = weakref.finalize(self, _desenlazar, self._instituciones)
+        filas = self.conexion.execute("SELECT id, tipo, nombre, presupuesto FROM instituciones ORDER BY id")
+        self._indexar_lote(filas)
+
+    def _indexar(self, id_inst, tipo, nombre, presupuesto, institucion=None):
+        # Indexa una fila; si se pasa 'institucion', se enlaza esa misma en lugar de crear otra
+        if institucion is None:
+            institucion = FABRICAS[tipo].crear_institucion(nombre, convertir_presupuesto(presupuesto))
+        _ENLACES[id(institucion)] = (self._referencia, id_inst)  # Sus cambios pasan por actualizar()
+        self._instituciones[id_inst] = institucion
+        self._por_nombre.setdefault(nombre.lower(), []).append(id_inst)
+        self._por_tipo[tipo].append(id_inst)
+        return institucion
+
+    def _indexar_lote(self, filas):
+        # Indexa muchas filas y ordena el índice de presupuestos una sola vez al final
+        for id_inst, tipo, nombre, presupuesto in filas:
+            institucion = self._indexar(id_inst, tipo, nombre, presupuesto)
+            self._presupuestos[tipo].append((institucion.presupuesto, id_inst))
+        for indice in self._presupuestos.values():
+            indice.sort()
+
+    def crear(self, tipo, nombre, presupuesto):
+        # Crea una institución con la fábrica del tipo indicado, la guarda y la devuelve
+        if tipo not in FABRICAS:
+            raise ValueError(f"Tipo de institución desconocido: {tipo}")
+        return self._guardar(tipo, nombre, convertir_presupuesto(presupuesto))
+
+    def registrar(self, institucion):
+        # Guarda una institución ya creada por una fábrica y la devuelve (es la misma instancia:
+        # desde ahora sus cambios de nombre o presupuesto pasan por el registro)
+        if id(institucion) in _ENLACES:
+            raise ValueError(f"La institución {institucion.nombre} ya está registrada")
+        presupuesto = convertir_presupuesto(institucion.presupuesto)
+        institucion._presupuesto = presupuesto
+        return self._guardar(TIPOS[type(institucion)], institucion.nombre, presupuesto, institucion)
+
+    def _guardar(self, tipo, nombre, presupuesto, institucion=None):
+        with self.conexion:
+            cursor = self.conexion.execute(
+                "INSERT INTO instituciones (tipo, nombre, presupuesto) VALUES (?, ?, ?)",
+                (tipo, nombre, presupuesto))
+        institucion = self._indexar(cursor.lastrowid, tipo, nombre, presupuesto, institucion)
+        bisect.insort(self._presupuestos[tipo], (presupuesto, cursor.lastrowid))
+        return institucion
+
+    def importar(self, filas):
+        # Importa muchas filas (tipo, nombre, presupuesto) en una sola transacción; devuelve cuántas
+        validas = []
+        for tipo, nombre, presupuesto in filas:
+            if tipo not in FABRICAS:
+                raise ValueError(f"Tipo de institución desconocido: {tipo}")
+            validas.append((tipo, nombre, convertir_presupuesto(presupuesto)))
+        if not validas:
+            return 0
+        with self.conexion:
+            siguiente = self.conexion.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM instituciones").fetchone()[0]
+            filas_con_id = [(siguiente + i, tipo, nombre, presupuesto)
+                            for i, (tipo, nombre, presupuesto) in enumerate(validas)]
+            self.conexion.executemany(
+                "INSERT INTO instituciones (id, tipo, nombre, presupuesto) VALUES (?, ?, ?, ?)", filas_con_id)
+        self._indexar_lote(filas_con_id)
+        return len(filas_con_id)
+
+    def actualizar(self, id_inst, nombre=None, presupuesto=None):
+        # Cambia el nombre y/o el presupuesto de una institución registrada: guarda en la base
+        # y mueve la institución en los índices (también se usa al asignar inst.nombre o inst.presupuesto)
+        institucion = self._instituciones[id_inst]
+        tipo = TIPOS[type(institucion)]
+        nuevo_nombre = institucion.nombre if nombre is None else nombre
+        nuevo_presupuesto = institucion.presupuesto if presupuesto is None else convertir_presupuesto(presupuesto)
+        with self.conexion:
+            self.conexion.execute("UPDATE instituciones SET nombre = ?, presupuesto = ? WHERE id = ?",
+                                  (nuevo_nombre, nuevo_presupuesto, id_inst))
+        if nuevo_nombre.lower() != institucion.nombre.lower():
+            ids = self._por_nombre[institucion.nombre.lower()]
+            ids.remove(id_inst)
+            if not ids:
+                del self._por_nombre[institucion.nombre.lower()]
+            bisect.insort(self._por_nombre.setdefault(nuevo_nombre.lower(), []), id_inst)
+        if nuevo_presupuesto != institucion.presupuesto:
+            indice = self._presupuestos[tipo]
+            posicion = bisect.bisect_left(indice, (institucion.presupuesto, id_inst))
+            del indice[posicion]
+            bisect.insort(indice, (nuevo_presupuesto, id_inst))
+        institucion._nombre, institucion._presupuesto = nuevo_nombre, nuevo_presupuesto
+        self._descripciones.pop(id_inst, None)  # La descripción guardada ya no es válida
+        return institucion
+
+    def descripcion(self, id_inst):
+        # Descripción de una institución registrada, renderizada una sola vez
+        texto = self._descripciones.get(id_inst)
+        if texto is None:
+            texto = self._descripciones[id_inst] = self._instituciones[id_inst].describir()
+        return texto
+
+    def importar_csv(self, ruta):
+        # Importa un CSV con las columnas tipo, nombre y presupuesto
+        with open(ruta, "r", encoding="utf-8", newline="") as archivo:
+            return self.importar((fila["tipo"], fila["nombre"], fila["presupuesto"])
+                                 for fila in csv.DictReader(archivo))
+
+    def buscar_por_nombre(self, nombre):
+        return [self._instituciones[i] for i in self._por_nombre.get(nombre.lower(), [])]
+
+    def por_tipo(self, tipo):
+        return [self._instituciones[i] for i in self._por_tipo.get(tipo, [])]
+
+    def rango_presupuesto(self, minimo=None, maximo=None, tipo=None):
+        # Instituciones con presupuesto entre minimo y maximo (ambos incluidos), ordenadas por presupuesto
+        tipos = [tipo] if tipo else list(self._presupuestos)
+        resultado = []
+        for t in tipos:
+            indice = self._presupuestos[t]
+            desde = 0 if minimo is None else bisect.bisect_left(indice, (minimo, -1))
+            hasta = len(indice) if maximo is None else bisect.bisect_right(indice, (maximo, float("inf")))
+            resultado.extend(indice[desde:hasta])
+        if len(tipos) > 1:
+            resultado.sort()
+        return [self._instituciones[i] for _, i in resultado]
+
+    def iterar(self, tipo=None):
+        # Recorre las instituciones en orden de registro, opcionalmente solo las de un tipo
+        if tipo is None:
+            return iter(self._instituciones.values())
+        return (self._instituciones[i] for i in self._por_tipo.get(tipo, []))
+
+    def __len__(self):
+        return len(self._instituciones)
+
+    def __iter__(self):
+        return iter(self._instituciones.values())  # En orden de registro
+
+    def cerrar(self):
+        self._desenlazar()  # Sus instituciones vuelven a cambiarse sin pasar por el registro
+        self.conexion.close()
+
+
+def _desenlazar(instituciones):
+    for institucion in instituciones.values():
+        _ENLACES.pop(id(institucion), None)
+
+
+# Listado de instituciones
+# Las descripciones se generan a medida que se piden (generadores), por páginas,
+# así el listado empieza de inmediato y no ocupa más memoria con registros grandes.
+
+def generar_descripciones(instituciones, tipo=None, inicio=1):
+    # Genera las líneas numeradas "n. descripción"; 'tipo' filtra por "publica" o "privada"
+    if tipo is not None:
+        instituciones = (inst for inst in instituciones if TIPOS[type(inst)] == tipo)
+    for i, inst in enumerate(instituciones, inicio):
+        yield f"{i}. {inst.descripcion}"
+
+def paginar(lineas, tamano_pagina=20):
+    # Agrupa un iterable de líneas en páginas (listas) de tamaño fijo, sin recorrerlo entero
+    lineas = iter(lineas)
+    while True:
+        pagina = list(itertools.islice(lineas, tamano_pagina))
+        if not pagina:
+            return
+        yield pagina
+
+def exportar_listado(instituciones, salida=None, tipo=None, tamano_bufer=1 << 20):
+    # Escribe el listado en un archivo (o en stdout) con un búfer grande; devuelve la cantidad de líneas
+    archivo = sys.stdout if salida is None else open(salida, "w", encoding="utf-8", buffering=tamano_bufer)
+    total = 0
+    try:
+        for pagina in paginar(generar_descripciones(instituciones, tipo), 1000):
+            archivo.write("\n".join(pagina))
+            archivo.write("\n")
+            total += len(pagina)
+        archivo.flush()
+    finally:
+        if salida is not None:
+            archivo.close()
+    return total
+
+
+# Benchmark
+
+def benchmark(n=200_000):
+    # Compara la creación una por una (como en el menú original) contra crear_lote
+    filas = [(f"Institución {i}", str(i % 5000 + 0.5)) for i in range(n)]
+
+    class InstitucionConDict:  # Misma estructura que la versión original, con __dict__
+        def __init__(self, nombre, presupuesto):
+            self.nombre = nombre
+            self.presupuesto = presupuesto
+
+    def medir(funcion):
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        resultado = funcion()
+        duracion = time.perf_counter() - inicio
+        memoria = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return resultado, duracion, memoria
+
+    print(f"\n--- Benchmark de creación ({n} instituciones) ---")
+    casos = [
+        ("Una por una, con __dict__",
+         lambda: [InstitucionConDict(nombre, presupuesto) for nombre, presupuesto in filas]),
+        ("Una por una, fábrica nueva",
+         lambda: [FabricaPrivada().crear_institucion(nombre, convertir_presupuesto(presupuesto))
+                  for nombre, presupuesto in filas]),
+        ("crear_lote", lambda: FabricaPrivada().crear_lote(filas)),
+    ]
+    for nombre_caso, funcion in casos:
+        _, duracion, memoria = medir(funcion)
+        print(f"{nombre_caso}: {n / duracion:,.0f} instituciones/s | "
+              f"{memoria / n:.0f} bytes por institución")
+
+
 # Menú Interactivo
 
-def menu():
-    instituciones = []  # Lista para almacenar las instituciones creadas
+def menu(ruta=":memory:"):
+    registro = RegistroInstituciones(ruta)  # Registro donde se almacenan las instituciones creadas
 
     while True:
         # Muestra el menú de opciones
@@ -56,39 +368,52 @@ def menu():
         print("1. Crear institución pública")
         print("2. Crear institución privada")
         print("3. Ver instituciones registradas")
-        print("4. Salir")
+        print("4. Buscar por rango de presupuesto")
+        print("5. Salir")
 
         opcion = input("Selecciona una opción: ")  # Captura la opción del usuario
 
-        if opcion == "1":
-            # Crear institución pública
-            nombre = input("Nombre de la institución pública: ")
+        if opcion in ("1", "2"):
+            # Crear institución pública o privada
+            tipo = "publica" if opcion == "1" else "privada"
+            nombre = input(f"Nombre de la institución {'pública' if tipo == 'publica' else 'privada'}: ")
             presupuesto = input("Presupuesto en millones: ")
-            fabrica = FabricaPublica()  # Usa la fábrica pública
-            institucion = fabrica.crear_institucion(nombre, presupuesto)  # Crea la instancia
-            instituciones.append(institucion)  # Agrega a la lista
-            print("✅ Institución pública creada con éxito.")
-
-        elif opcion == "2":
-            # Crear institución privada
-            nombre = input("Nombre de la institución privada: ")
-            presupuesto = input("Presupuesto en millones: ")
-            fabrica = FabricaPrivada()  # Usa la fábrica privada
-            institucion = fabrica.crear_institucion(nombre, presupuesto)  # Crea la instancia
-            instituciones.append(institucion)  # Agrega a la lista
-            print("✅ Institución privada creada con éxito.")
+            try:
+                registro.crear(tipo, nombre, presupuesto)  # Usa la fábrica del tipo y guarda la instancia
+            except ValueError:
+                print("⚠️ Presupuesto inválido. Debe ser un número positivo.")
+                continue
+            print(f"✅ Institución {'pública' if tipo == 'publica' else 'privada'} creada con éxito.")
 
         elif opcion == "3":
             # Mostrar instituciones registradas
             print("\n📋 Instituciones registradas:")
-            if not instituciones:
+            if not len(registro):
                 print("No hay instituciones aún.")
             else:
-                for i, inst in enumerate(instituciones, 1):  # Muestra todas con su descripción
-                    print(f"{i}. {inst.describir()}")
+                for pagina in paginar(generar_descripciones(registro), 20):  # Muestra de a 20 por página
+                    print("\n".join(pagina))
+                    if len(pagina) == 20 and input("Enter para ver más, 'q' para volver: ").lower() == "q":
+                        break
 
         elif opcion == "4":
+            # Buscar instituciones por rango de presupuesto (y opcionalmente por tipo)
+            try:
+                minimo = convertir_presupuesto(input("Presupuesto mínimo: "))
+                maximo = convertir_presupuesto(input("Presupuesto máximo: "))
+            except ValueError:
+                print("⚠️ Los presupuestos deben ser números positivos.")
+                continue
+            tipo = {"1": "publica", "2": "privada"}.get(input("Tipo (1 = pública, 2 = privada, Enter = todas): "))
+            encontradas = registro.rango_presupuesto(minimo, maximo, tipo)
+            if not encontradas:
+                print("No hay instituciones en ese rango.")
+            for linea in generar_descripciones(encontradas):
+                print(linea)
+
+        elif opcion == "5":
             # Salir del programa
+            registro.cerrar()
             print("👋 Saliendo del programa.")
             break
 
@@ -99,4 +424,24 @@ def menu():
 # Punto de entrada
 
 if __name__ == "__main__":
-    menu()  # Llama a la función del menú si se ejecuta directamente el script
+    parser = argparse.ArgumentParser(description="Registro de instituciones con el patrón Abstract Factory")
+    parser.add_argument("--db", default=":memory:", help="Archivo SQLite donde guardar el registro")
+    parser.add_argument("--benchmark", action="store_true", help="Ejecuta el benchmark de creación")
+    parser.add_argument("--importar", metavar="CSV", help="Importa un CSV (tipo,nombre,presupuesto) y termina")
+    parser.add_argument("--exportar", metavar="ARCHIVO",
+                        help="Exporta el listado de instituciones ('-' = stdout) y termina")
+    parser.add_argument("--tipo", choices=["publica", "privada"], help="Filtra el listado exportado por tipo")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark()
+    elif args.importar:
+        registro = RegistroInstituciones(args.db)
+        print(f"✅ {registro.importar_csv(args.importar)} instituciones importadas.")
+        registro.cerrar()
+    elif args.exportar:
+        registro = RegistroInstituciones(args.db)
+        exportar_listado(registro.iterar(args.tipo), None if args.exportar == "-" else args.exportar)
+        registro.cerrar()
+    else:
+        menu(args.db)  # Llama a la función del menú si se ejecuta directamente el script
@@ -1,4 +1,19 @@
+import argparse  # Se usa para el modo no interactivo por línea de comandos
+import asyncio  # Se usa para la traducción asíncrona
+import io  # Se usa para la lectura y escritura con búfer
+import json  # Se usa para leer y escribir registros JSONL
+import mmap  # Se usa para abrir los lexicones binarios sin cargarlos en memoria
+import os  # Se usa para armar rutas de archivos temporales y reemplazar lexicones
+import re  # Se usa para separar las oraciones en palabras
+import struct  # Se usa para el formato binario de los lexicones
+import sys  # Se usa para acceder a stdin/stdout
+import tempfile  # Se usa para los archivos temporales (lexicones y benchmark)
+import threading  # Se usa para proteger la caché en programas con varios hilos
+import time  # Se usa para medir el rendimiento en el benchmark
 from abc import ABC, abstractmethod  # Se importa el módulo para definir clases abstractas
+from collections import OrderedDict  # Se usa para la caché LRU
+from collections.abc import Mapping  # Interfaz de solo lectura para los lexicones binarios
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor  # Ejecución en paralelo
 
 # Target
 class Traductor(ABC):  # Interfaz esperada por el cliente
@@ -6,38 +21,349 @@ class Traductor(ABC):  # Interfaz esperada por el cliente
     def traducir(self, frase: str) -> str:  # Método abstracto que todas las clases adaptadoras deben implementar
         pass
 
+    def traducir_lote(self, frases) -> list:
+        # Traduce varias frases de una sola vez; los adaptadores pueden sobreescribirlo con una versión más rápida
+        return [self.traducir(frase) for frase in frases]
+
+    def traducir_oracion(self, texto: str) -> str:
+        # Traduce un texto libre; por defecto se trata como una sola frase
+        return self.traducir(texto)
+
+    def buscador(self):
+        # Función que traduce una frase ya pasada a minúsculas; los adaptadores pueden
+        # devolver la búsqueda del adaptee para no normalizar la frase otra vez
+        return self.traducir
+
+    async def traducir_async(self, frase: str) -> str:
+        # Versión asíncrona; por defecto ejecuta la traducción en un hilo para no bloquear el bucle de eventos
+        return await asyncio.to_thread(self.traducir, frase)
+
+    async def traducir_lote_async(self, frases) -> list:
+        return await asyncio.to_thread(self.traducir_lote, list(frases))
+
 # Adaptees 
 # Clases existentes que no siguen la interfaz 'Traductor'
 
+# Los diccionarios se construyen una sola vez por idioma (a nivel de clase)
+# y se comparten entre todas las instancias, en lugar de recrearse en cada llamada.
+
 class TraductorEspanol:
+    # Diccionario de traducción del inglés al español
+    traducciones = {
+        "hello": "hola",
+        "goodbye": "adiós",
+        "thank you": "gracias"
+    }
+    no_encontrada = "[traducción no encontrada]"  # Mensaje por defecto
+
+    def __init__(self, traducciones=None):
+        if traducciones is not None:
+            self.traducciones = traducciones  # Permite usar otro diccionario (p. ej. un LexiconBinario) en esta instancia
+
     def traducir_desde_ingles(self, frase):
-        # Diccionario de traducción del inglés al español
-        traducciones = {
-            "hello": "hola",
-            "goodbye": "adiós",
-            "thank you": "gracias"
-        }
-        return traducciones.get(frase.lower(), "[traducción no encontrada]")  # Traducción o mensaje por defecto
+        return self.traducciones.get(frase.lower(), self.no_encontrada)  # Traducción o mensaje por defecto
+
+    def buscar(self, clave):
+        return self.traducciones.get(clave, self.no_encontrada)  # Traducción de una frase ya en minúsculas
+
+    def traducir_lote_desde_ingles(self, frases):
+        obtener = self.traducciones.get
+        defecto = self.no_encontrada
+        return [obtener(frase.lower(), defecto) for frase in frases]  # Traducción de varias frases de una sola vez
 
 class TraductorFrances:
+    # Diccionario de traducción del inglés al francés
+    traductions = {
+        "hello": "bonjour",
+        "goodbye": "au revoir",
+        "thank you": "merci"
+    }
+    non_trouvee = "[traduction non trouvée]"  # Mensaje por defecto
+
+    def __init__(self, traductions=None):
+        if traductions is not None:
+            self.traductions = traductions  # Permite usar otro diccionario (p. ej. un LexiconBinario) en esta instancia
+
     def traduire_depuis_anglais(self, phrase):
-        # Diccionario de traducción del inglés al francés
-        traductions = {
-            "hello": "bonjour",
-            "goodbye": "au revoir",
-            "thank you": "merci"
-        }
-        return traductions.get(phrase.lower(), "[traduction non trouvée]")  # Traducción o mensaje por defecto
+        return self.traductions.get(phrase.lower(), self.non_trouvee)  # Traducción o mensaje por defecto
+
+    def chercher(self, cle):
+        return self.traductions.get(cle, self.non_trouvee)  # Traducción de una frase ya en minúsculas
+
+    def traduire_lot_depuis_anglais(self, phrases):
+        obtener = self.traductions.get
+        defecto = self.non_trouvee
+        return [obtener(phrase.lower(), defecto) for phrase in phrases]  # Traducción de varias frases de una sola vez
 
 class TraductorAleman:
+    # Diccionario de traducción del inglés al alemán
+    übersetzungen = {
+        "hello": "hallo",
+        "goodbye": "auf wiedersehen",
+        "thank you": "danke"
+    }
+    nicht_gefunden = "[übersetzung nicht gefunden]"  # Mensaje por defecto
+
+    def __init__(self, übersetzungen=None):
+        if übersetzungen is not None:
+            self.übersetzungen = übersetzungen  # Permite usar otro diccionario (p. ej. un LexiconBinario) en esta instancia
+
     def aus_englisch_übersetzen(self, satz):
-        # Diccionario de traducción del inglés al alemán
-        übersetzungen = {
-            "hello": "hallo",
-            "goodbye": "auf wiedersehen",
-            "thank you": "danke"
-        }
-        return übersetzungen.get(satz.lower(), "[übersetzung nicht gefunden]")  # Traducción o mensaje por defecto
+        return self.übersetzungen.get(satz.lower(), self.nicht_gefunden)  # Traducción o mensaje por defecto
+
+    def suchen(self, schlüssel):
+        return self.übersetzungen.get(schlüssel, self.nicht_gefunden)  # Traducción de una frase ya en minúsculas
+
+    def stapel_aus_englisch_übersetzen(self, sätze):
+        obtener = self.übersetzungen.get
+        defecto = self.nicht_gefunden
+        return [obtener(satz.lower(), defecto) for satz in sätze]  # Traducción de varias frases de una sola vez
+
+# Lexicón binario en disco
+# Formato: cabecera (firma, versión, cantidad de entradas), un arreglo de
+# desplazamientos de 64 bits y un bloque con las cadenas UTF-8. La entrada i
+# tiene su clave en bloque[d[2i]:d[2i+1]] y su traducción en bloque[d[2i+1]:d[2i+2]].
+# Las claves están ordenadas, así que se buscan por búsqueda binaria directamente
+# sobre el archivo mapeado en memoria, sin deserializarlo. Las claves se guardan
+# normalizadas (palabras en minúsculas separadas por un espacio), igual que se
+# separan las oraciones, para que el modo oración encuentre también "good-bye".
+
+FIRMA_LEXICON = b"LEXB"
+VERSION_LEXICON = 2  # La versión 1 guardaba las claves sin normalizar
+PATRON_PALABRA = re.compile(r"[^\W_]+(?:'[^\W_]+)*")  # Palabras (con apóstrofos internos)
+
+def normalizar_frase(frase):
+    # "Good-bye,  Sir" -> "good bye sir": las mismas palabras que se buscan en una oración
+    return " ".join(PATRON_PALABRA.findall(frase.lower()))
+CABECERA_LEXICON = struct.Struct("<4sHHQ")  # Firma, versión, reservado, cantidad de entradas
+
+def construir_lexicon(entradas, ruta):
+    # Escribe un lexicón binario a partir de un diccionario o de pares (frase, traducción)
+    if isinstance(entradas, Mapping):
+        entradas = entradas.items()
+    tabla = {}
+    for frase, traduccion in entradas:
+        clave = normalizar_frase(frase)
+        if clave:  # Una frase sin palabras (solo puntuación) no se podría buscar
+            tabla[clave.encode("utf-8")] = traduccion.encode("utf-8")  # Si se repite, gana la última
+    claves = sorted(tabla)
+
+    desplazamientos = [0]
+    for clave in claves:
+        desplazamientos.append(desplazamientos[-1] + len(clave))
+        desplazamientos.append(desplazamientos[-1] + len(tabla[clave]))
+
+    # Se escribe en un archivo temporal de la misma carpeta y se reemplaza de una vez: los procesos
+    # que tienen mapeado el lexicón anterior lo siguen leyendo (truncarlo los haría fallar con SIGBUS)
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(ruta)), suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as archivo:
+            archivo.write(CABECERA_LEXICON.pack(FIRMA_LEXICON, VERSION_LEXICON, 0, len(claves)))
+            archivo.write(struct.pack(f"<{len(desplazamientos)}Q", *desplazamientos))
+            for clave in claves:
+                archivo.write(clave)
+                archivo.write(tabla[clave])
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(temporal, ruta)
+    except BaseException:
+        os.remove(temporal)
+        raise
+    return len(claves)
+
+def construir_lexicon_tsv(ruta_tsv, ruta):
+    # Construye un lexicón a partir de un archivo con líneas "frase<TAB>traducción"
+    def pares():
+        with open(ruta_tsv, "r", encoding="utf-8") as archivo:
+            for linea in archivo:
+                frase, separador, traduccion = linea.rstrip("\r\n").partition("\t")
+                if separador:
+                    yield frase, traduccion
+    return construir_lexicon(pares(), ruta)
+
+class LexiconBinario(Mapping):
+    # Diccionario de solo lectura respaldado por un archivo mapeado en memoria;
+    # varios procesos que abren el mismo archivo comparten las páginas en caché
+    def __init__(self, ruta):
+        self.ruta = ruta
+        with open(ruta, "rb") as archivo:
+            self._mm = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        firma, version, _, self._cantidad = CABECERA_LEXICON.unpack_from(self._mm, 0)
+        if firma != FIRMA_LEXICON or version != VERSION_LEXICON:
+            self._mm.close()
+            raise ValueError(f"{ruta} no es un lexicón binario válido")
+        inicio = CABECERA_LEXICON.size
+        fin = inicio + 8 * (2 * self._cantidad + 1)
+        self._desplazamientos = memoryview(self._mm)[inicio:fin].cast("Q")
+        self._bloque = fin  # Posición donde empiezan las cadenas
+
+    def _cadena(self, indice):
+        # Devuelve los bytes entre dos desplazamientos consecutivos
+        d = self._desplazamientos
+        return self._mm[self._bloque + d[indice]:self._bloque + d[indice + 1]]
+
+    def _cota_inferior(self, clave):
+        # Búsqueda binaria: posición de la primera clave >= 'clave' (en bytes)
+        bajo, alto = 0, self._cantidad
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if self._cadena(2 * medio) < clave:
+                bajo = medio + 1
+            else:
+                alto = medio
+        return bajo
+
+    def _buscar(self, clave):
+        # Posición de la clave (ya normalizada) o -1
+        clave = clave.encode("utf-8")
+        posicion = self._cota_inferior(clave)
+        if posicion < self._cantidad and self._cadena(2 * posicion) == clave:
+            return posicion
+        return -1
+
+    def _traduccion(self, clave):
+        # Traducción de una clave ya normalizada o None
+        posicion = self._buscar(clave)
+        return None if posicion < 0 else self._cadena(2 * posicion + 1).decode("utf-8")
+
+    def tiene_prefijo(self, prefijo):
+        # True si alguna clave empieza por 'prefijo' (las claves con ese prefijo están seguidas).
+        # El prefijo se compara tal cual: se espera ya normalizado, p. ej. "thank "
+        clave = prefijo.encode("utf-8")
+        posicion = self._cota_inferior(clave)
+        return posicion < self._cantidad and self._cadena(2 * posicion).startswith(clave)
+
+    def get(self, frase, defecto=None):
+        traduccion = self._traduccion(normalizar_frase(frase))
+        return defecto if traduccion is None else traduccion
+
+    def __getitem__(self, frase):
+        traduccion = self._traduccion(normalizar_frase(frase))
+        if traduccion is None:
+            raise KeyError(frase)
+        return traduccion
+
+    def __contains__(self, frase):
+        return self._buscar(normalizar_frase(frase)) >= 0
+
+    def __iter__(self):
+        for posicion in range(self._cantidad):
+            yield self._cadena(2 * posicion).decode("utf-8")
+
+    def items(self):
+        for posicion in range(self._cantidad):
+            yield (self._cadena(2 * posicion).decode("utf-8"),
+                   self._cadena(2 * posicion + 1).decode("utf-8"))
+
+    def __len__(self):
+        return self._cantidad
+
+    def cerrar(self):
+        self._desplazamientos.release()
+        self._mm.close()
+
+    def __reduce__(self):
+        # Al enviarlo a otro proceso solo viaja la ruta; el proceso vuelve a mapear el mismo archivo
+        return (LexiconBinario, (self.ruta,))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
+
+# Índice de frases (trie)
+# Permite traducir oraciones completas buscando, palabra por palabra, la frase
+# más larga del diccionario que coincide en cada posición (p. ej. "thank you").
+# Las frases del diccionario se separan en palabras con PATRON_PALABRA, igual que el texto.
+
+class TrieFrases:
+    _FIN = ""  # Clave que marca el final de una frase (ninguna palabra es vacía)
+
+    def __init__(self, diccionario):
+        self.raiz = {}
+        for frase, traduccion in diccionario.items():
+            palabras = PATRON_PALABRA.findall(frase.lower())
+            if not palabras:
+                continue  # Solo puntuación: no puede aparecer como palabra en una oración
+            nodo = self.raiz
+            for palabra in palabras:
+                nodo = nodo.setdefault(palabra, {})
+            nodo[self._FIN] = traduccion  # Guarda la traducción en el último nodo
+
+    def traducir(self, texto):
+        # Recorre el texto una vez y reemplaza las coincidencias más largas;
+        # lo que no está en el diccionario (y la puntuación) se conserva tal cual
+        tokens = [(m.start(), m.end(), m.group().lower()) for m in PATRON_PALABRA.finditer(texto)]
+        partes = []
+        ultimo = 0  # Posición del texto original hasta la que ya se copió
+        i = 0
+        while i < len(tokens):
+            nodo = self.raiz
+            fin = None  # Índice del último token de la coincidencia más larga
+            traduccion = None
+            j = i
+            while j < len(tokens) and tokens[j][2] in nodo:
+                nodo = nodo[tokens[j][2]]
+                if self._FIN in nodo:
+                    fin, traduccion = j, nodo[self._FIN]
+                j += 1
+            if fin is None:
+                i += 1  # Sin coincidencia: la palabra queda sin traducir
+                continue
+            partes.append(texto[ultimo:tokens[i][0]])
+            partes.append(traduccion)
+            ultimo = tokens[fin][1]
+            i = fin + 1
+        partes.append(texto[ultimo:])
+        return "".join(partes)
+
+class FrasesLexicon:
+    # Misma traducción por coincidencia más larga que TrieFrases, pero buscando por prefijo
+    # directamente en el LexiconBinario (ordenado): no arma nada en memoria
+    def __init__(self, lexicon):
+        self.lexicon = lexicon
+
+    def traducir(self, texto):
+        tokens = [(m.start(), m.end(), m.group().lower()) for m in PATRON_PALABRA.finditer(texto)]
+        partes = []
+        ultimo = 0  # Posición del texto original hasta la que ya se copió
+        i = 0
+        while i < len(tokens):
+            frase = tokens[i][2]
+            fin = None  # Índice del último token de la coincidencia más larga
+            traduccion = None
+            j = i
+            while True:
+                encontrada = self.lexicon._traduccion(frase)  # 'frase' ya está normalizada
+                if encontrada is not None:
+                    fin, traduccion = j, encontrada
+                j += 1
+                if j >= len(tokens) or not self.lexicon.tiene_prefijo(frase + " "):
+                    break  # Ninguna frase más larga empieza así
+                frase = f"{frase} {tokens[j][2]}"
+            if fin is None:
+                i += 1  # Sin coincidencia: la palabra queda sin traducir
+                continue
+            partes.append(texto[ultimo:tokens[i][0]])
+            partes.append(traduccion)
+            ultimo = tokens[fin][1]
+            i = fin + 1
+        partes.append(texto[ultimo:])
+        return "".join(partes)
+
+_tries = {}  # Un trie por diccionario de idioma, construido la primera vez que se usa
+
+def obtener_trie(diccionario):
+    # Devuelve el índice de frases del diccionario: para un LexiconBinario, búsqueda por prefijo
+    # sobre el archivo; para un diccionario, el trie compartido (se guarda también el diccionario
+    # para que su id sea estable)
+    if isinstance(diccionario, LexiconBinario):
+        return FrasesLexicon(diccionario)
+    entrada = _tries.get(id(diccionario))
+    if entrada is None:
+        entrada = _tries[id(diccionario)] = (diccionario, TrieFrases(diccionario))
+    return entrada[1]
 
 #  Adapters
 # Estas clases adaptan los "Adaptees" a la interfaz "Traductor"
@@ -49,6 +375,15 @@ class AdaptadorEspanol(Traductor):
     def traducir(self, frase: str) -> str:
         return self.traductor.traducir_desde_ingles(frase)  # Adapta el método al interfaz esperado
 
+    def traducir_lote(self, frases) -> list:
+        return self.traductor.traducir_lote_desde_ingles(frases)  # Adapta la traducción por lotes del adaptee
+
+    def buscador(self):
+        return self.traductor.buscar
+
+    def traducir_oracion(self, texto: str) -> str:
+        return obtener_trie(self.traductor.traducciones).traducir(texto)  # Traducción por coincidencia más larga
+
 class AdaptadorFrances(Traductor):
     def __init__(self, traducteur_francais):
         self.traducteur = traducteur_francais  # Instancia del traductor específico
@@ -56,6 +391,15 @@ class AdaptadorFrances(Traductor):
     def traducir(self, frase: str) -> str:
         return self.traducteur.traduire_depuis_anglais(frase)  # Adapta el método al interfaz esperado
 
+    def traducir_lote(self, frases) -> list:
+        return self.traducteur.traduire_lot_depuis_anglais(frases)  # Adapta la traducción por lotes del adaptee
+
+    def buscador(self):
+        return self.traducteur.chercher
+
+    def traducir_oracion(self, texto: str) -> str:
+        return obtener_trie(self.traducteur.traductions).traducir(texto)  # Traducción por coincidencia más larga
+
 class AdaptadorAleman(Traductor):
     def __init__(self, deutscher_übersetzer):
         self.übersetzer = deutscher_übersetzer  # Instancia del traductor específico
@@ -63,6 +407,317 @@ class AdaptadorAleman(Traductor):
     def traducir(self, frase: str) -> str:
         return self.übersetzer.aus_englisch_übersetzen(frase)  # Adapta el método al interfaz esperado
 
+    def traducir_lote(self, frases) -> list:
+        return self.übersetzer.stapel_aus_englisch_übersetzen(frases)  # Adapta la traducción por lotes del adaptee
+
+    def buscador(self):
+        return self.übersetzer.suchen
+
+    def traducir_oracion(self, texto: str) -> str:
+        return obtener_trie(self.übersetzer.übersetzungen).traducir(texto)  # Traducción por coincidencia más larga
+
+# Caché de traducciones
+# Adaptador que envuelve cualquier Traductor y guarda las traducciones más usadas
+# (LRU con caducidad opcional), útil cuando el traductor real es costoso.
+
+class TraductorConCache(Traductor):
+    def __init__(self, traductor, capacidad=10_000, ttl=None):
+        if capacidad <= 0:
+            raise ValueError("La capacidad de la caché debe ser mayor que cero")
+        self.traductor = traductor  # Traductor envuelto
+        self.capacidad = capacidad  # Cantidad máxima de frases guardadas
+        self.ttl = ttl  # Segundos de validez de cada entrada (None = sin caducidad)
+        self._cache = OrderedDict()  # frase normalizada -> (traducción, momento de caducidad)
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    def traducir(self, frase: str) -> str:
+        clave = frase.lower()  # Misma normalización que usan los traductores
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._cache.get(clave)
+            if entrada is not None and (entrada[1] is None or entrada[1] > ahora):
+                self._cache.move_to_end(clave)  # Marca la entrada como usada recientemente
+                self.aciertos += 1
+                return entrada[0]
+            self.fallos += 1
+
+        # La traducción real se hace fuera del bloqueo para no frenar a otros hilos
+        traduccion = self.traductor.traducir(frase)
+        caducidad = ahora + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._cache[clave] = (traduccion, caducidad)
+            self._cache.move_to_end(clave)
+            while len(self._cache) > self.capacidad:
+                self._cache.popitem(last=False)  # Desaloja la entrada menos usada
+                self.desalojos += 1
+        return traduccion
+
+    def traducir_lote(self, frases) -> list:
+        return [self.traducir(frase) for frase in frases]
+
+    def traducir_oracion(self, texto: str) -> str:
+        return self.traductor.traducir_oracion(texto)  # Las oraciones no se guardan en caché
+
+    def limpiar(self):
+        # Vacía la caché y reinicia las estadísticas
+        with self._lock:
+            self._cache.clear()
+            self.aciertos = self.fallos = self.desalojos = 0
+
+    def estadisticas(self):
+        # Devuelve las métricas de uso de la caché
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "tamano": len(self._cache),
+                "capacidad": self.capacidad,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "desalojos": self.desalojos,
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0
+            }
+
+# Traducción en paralelo
+# Reparte lotes grandes en bloques entre un grupo de hilos (útil si el traductor
+# espera E/S, p. ej. un servicio remoto) o de procesos (útil si el trabajo usa CPU).
+# Los resultados siempre se devuelven en el mismo orden que las frases de entrada.
+
+_traductor_proceso = None  # Traductor de cada proceso trabajador
+
+def _inicializar_proceso(traductor):
+    global _traductor_proceso
+    _traductor_proceso = traductor  # Se envía una sola vez a cada proceso, no con cada bloque
+
+def _traducir_bloque_proceso(bloque):
+    return _traductor_proceso.traducir_lote(bloque)
+
+class EjecutorTraduccion:
+    def __init__(self, traductor, trabajadores=4, tamano_bloque=1000, procesos=False):
+        if trabajadores <= 0 or tamano_bloque <= 0:
+            raise ValueError("La cantidad de trabajadores y el tamaño de bloque deben ser mayores que cero")
+        self.traductor = traductor
+        self.tamano_bloque = tamano_bloque
+        if procesos:
+            self._ejecutor = ProcessPoolExecutor(trabajadores, initializer=_inicializar_proceso,
+                                                 initargs=(traductor,))
+            self._tarea = _traducir_bloque_proceso
+        else:
+            self._ejecutor = ThreadPoolExecutor(trabajadores)
+            self._tarea = traductor.traducir_lote
+
+    def traducir(self, frases) -> list:
+        # Traduce todas las frases repartiéndolas en bloques entre los trabajadores
+        resultado = []
+        for traducciones in self._ejecutor.map(self._tarea, en_lotes(frases, self.tamano_bloque)):
+            resultado.extend(traducciones)
+        return resultado
+
+    async def traducir_async(self, frases) -> list:
+        # Igual que traducir(), pero sin bloquear el bucle de eventos
+        bucle = asyncio.get_running_loop()
+        tareas = [bucle.run_in_executor(self._ejecutor, self._tarea, bloque)
+                  for bloque in en_lotes(frases, self.tamano_bloque)]
+        resultado = []
+        for traducciones in await asyncio.gather(*tareas):
+            resultado.extend(traducciones)
+        return resultado
+
+    def cerrar(self):
+        self._ejecutor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
+
+class TraductorRemotoSimulado(Traductor):
+    # Simula un servicio de traducción remoto: cada llamada espera 'latencia' segundos
+    def __init__(self, traductor, latencia=0.005):
+        self.traductor = traductor
+        self.latencia = latencia
+
+    def traducir(self, frase: str) -> str:
+        time.sleep(self.latencia)
+        return self.traductor.traducir(frase)
+
+    def traducir_lote(self, frases) -> list:
+        time.sleep(self.latencia)  # Una sola ida y vuelta por lote
+        return self.traductor.traducir_lote(frases)
+
+    async def traducir_async(self, frase: str) -> str:
+        await asyncio.sleep(self.latencia)
+        return self.traductor.traducir(frase)
+
+# Traducción multilingüe
+def crear_adaptador(idioma, tabla=None):
+    # Crea el adaptador de un idioma; 'tabla' permite reemplazar su diccionario (p. ej. por un LexiconBinario)
+    if idioma == "Español":
+        return AdaptadorEspanol(TraductorEspanol(tabla))
+    if idioma == "Francés":
+        return AdaptadorFrances(TraductorFrances(tabla))
+    if idioma == "Alemán":
+        return AdaptadorAleman(TraductorAleman(tabla))
+    raise ValueError(f"Idioma no soportado: {idioma}")
+
+def crear_adaptadores():
+    # Devuelve los adaptadores registrados, uno por idioma
+    return {idioma: crear_adaptador(idioma) for idioma in ("Español", "Francés", "Alemán")}
+
+def traducir_multilingue(frases, adaptadores=None):
+    # Traduce un mismo lote de frases a todos los idiomas registrados en una sola pasada:
+    # cada frase se normaliza una vez y se busca en el diccionario de cada idioma
+    if adaptadores is None:
+        adaptadores = crear_adaptadores()
+    resultados = {idioma: [] for idioma in adaptadores}
+    destinos = [(resultados[idioma].append, traductor.buscador()) for idioma, traductor in adaptadores.items()]
+    for frase in frases:
+        clave = frase.lower()
+        for agregar, buscar in destinos:
+            agregar(buscar(clave))
+    return resultados
+
+# Traducción en flujo (archivos o stdin)
+# Las frases se procesan con generadores en lotes de tamaño fijo, así la memoria
+# usada no depende del tamaño del archivo de entrada.
+
+CODIGOS_IDIOMA = {"es": "Español", "fr": "Francés", "de": "Alemán"}  # Códigos aceptados en la línea de comandos
+
+def leer_registros(archivo, jsonl=False, campo="frase"):
+    # Genera tuplas (registro, frase) a partir de un archivo de texto o JSONL, línea por línea.
+    # Una línea JSONL inválida o que no es un objeto lanza ValueError con su número de línea
+    for numero, linea in enumerate(archivo, 1):
+        linea = linea.rstrip("\r\n")
+        if jsonl:
+            if not linea.strip():
+                continue  # Ignora líneas vacías en JSONL
+            try:
+                registro = json.loads(linea)
+            except ValueError as error:
+                raise ValueError(f"Línea {numero}: JSON inválido ({error})") from None
+            if not isinstance(registro, dict):
+                raise ValueError(f"Línea {numero}: se esperaba un objeto JSON y se leyó {type(registro).__name__}")
+            yield registro, str(registro.get(campo, ""))
+        else:
+            yield None, linea
+
+def en_lotes(iterable, tamano):
+    # Agrupa un iterable en listas de como máximo 'tamano' elementos
+    lote = []
+    for elemento in iterable:
+        lote.append(elemento)
+        if len(lote) >= tamano:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+def traducir_flujo(registros, traductor, tamano_lote=4096, oraciones=False):
+    # Traduce los registros por lotes y genera tuplas (registro, frase, traducción)
+    for lote in en_lotes(registros, tamano_lote):
+        if oraciones:
+            traducciones = [traductor.traducir_oracion(frase) for _, frase in lote]
+        else:
+            traducciones = traductor.traducir_lote([frase for _, frase in lote])
+        for (registro, frase), traduccion in zip(lote, traducciones):
+            yield registro, frase, traduccion
+
+def escribir_resultados(resultados, salida, jsonl=False, campo_salida="traduccion"):
+    # Escribe cada resultado en la salida (que ya tiene búfer) y devuelve cuántos se escribieron
+    total = 0
+    for registro, frase, traduccion in resultados:
+        if jsonl:
+            registro[campo_salida] = traduccion
+            salida.write(json.dumps(registro, ensure_ascii=False))
+        else:
+            salida.write(traduccion)
+        salida.write("\n")
+        total += 1
+    salida.flush()
+    return total
+
+def traducir_archivo(traductor, entrada="-", salida="-", jsonl=False, campo="frase",
+                     tamano_lote=4096, tamano_bufer=1 << 20, oraciones=False):
+    # Traduce un archivo completo ("-" significa stdin/stdout) sin cargarlo en memoria
+    if entrada == "-":
+        archivo_entrada = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+    else:
+        archivo_entrada = open(entrada, "r", encoding="utf-8", buffering=tamano_bufer)
+    if salida == "-":
+        sys.stdout.flush()  # Lo que ya se imprimió sale antes que las traducciones
+        # Otro objeto de archivo sobre el mismo descriptor, con búfer grande; closefd=False deja abierto stdout
+        archivo_salida = open(sys.stdout.fileno(), "w", encoding="utf-8", buffering=tamano_bufer, closefd=False)
+    else:
+        archivo_salida = open(salida, "w", encoding="utf-8", buffering=tamano_bufer)
+
+    try:
+        registros = leer_registros(archivo_entrada, jsonl, campo)
+        resultados = traducir_flujo(registros, traductor, tamano_lote, oraciones)
+        return escribir_resultados(resultados, archivo_salida, jsonl)
+    finally:
+        # El envoltorio de stdin se separa sin cerrar sys.stdin; el de stdout se cierra sin cerrar el descriptor
+        if entrada != "-":
+            archivo_entrada.close()
+        else:
+            archivo_entrada.detach()
+        archivo_salida.close()
+
+# Benchmark
+def benchmark(n=200_000):
+    # Compara el rendimiento de traducir frase por frase contra traducir por lotes
+    frases = (["hello", "Goodbye", "THANK YOU", "good night"] * (n // 4 + 1))[:n]
+    adaptadores = crear_adaptadores()
+
+    print(f"\n--- Benchmark de traducción ({n} frases) ---")
+    for idioma, traductor in adaptadores.items():
+        inicio = time.perf_counter()
+        for frase in frases:
+            traductor.traducir(frase)
+        t_frase = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        traductor.traducir_lote(frases)
+        t_lote = time.perf_counter() - inicio
+
+        print(f"{idioma}: frase a frase {n / t_frase:,.0f} frases/s | "
+              f"por lote {n / t_lote:,.0f} frases/s (x{t_frase / t_lote:.1f})")
+
+    inicio = time.perf_counter()
+    traducir_multilingue(frases, adaptadores)
+    t_multi = time.perf_counter() - inicio
+    print(f"Multilingüe ({len(adaptadores)} idiomas): {n * len(adaptadores) / t_multi:,.0f} traducciones/s")
+
+def benchmark_paralelo(n=100_000, max_trabajadores=8, tamano_bloque=500):
+    # Muestra cómo escala la traducción en paralelo de 1 a N trabajadores
+    frases = (["hello", "Goodbye", "THANK YOU", "good night"] * (n // 4 + 1))[:n]
+    remoto = TraductorRemotoSimulado(crear_adaptador("Español"))
+    local = crear_adaptador("Español", obtener_lexicon_benchmark())
+
+    print(f"\n--- Benchmark en paralelo ({n} frases, bloques de {tamano_bloque}) ---")
+    trabajadores = 1
+    while trabajadores <= max_trabajadores:
+        with EjecutorTraduccion(remoto, trabajadores, tamano_bloque) as ejecutor:
+            inicio = time.perf_counter()
+            ejecutor.traducir(frases)
+            t_hilos = time.perf_counter() - inicio
+        with EjecutorTraduccion(local, trabajadores, tamano_bloque * 20, procesos=True) as ejecutor:
+            inicio = time.perf_counter()
+            ejecutor.traducir(frases)
+            t_procesos = time.perf_counter() - inicio
+        print(f"{trabajadores} trabajador(es): remoto con hilos {n / t_hilos:,.0f} frases/s | "
+              f"lexicón con procesos {n / t_procesos:,.0f} frases/s")
+        trabajadores *= 2
+
+def obtener_lexicon_benchmark(ruta=None):
+    # Crea un lexicón binario temporal con el diccionario en español para el benchmark
+    if ruta is None:
+        ruta = os.path.join(tempfile.gettempdir(), "lexicon_benchmark_es.bin")
+    construir_lexicon(TraductorEspanol.traducciones, ruta)
+    return LexiconBinario(ruta)
+
 # Menú 
 def menu():
     # Diccionario de opciones con instancias de adaptadores
@@ -95,4 +750,38 @@ def menu():
 
 # Ejecutar programa 
 if __name__ == "__main__":
-    menu()  # Llama al menú si el script se ejecuta directamente
+    parser = argparse.ArgumentParser(description="Traductor con el patrón Adapter")
+    parser.add_argument("--benchmark", action="store_true", help="Ejecuta el benchmark de traducción")
+    parser.add_argument("--benchmark-paralelo", action="store_true",
+                        help="Ejecuta el benchmark de traducción en paralelo (1 a N trabajadores)")
+    parser.add_argument("--trabajadores", type=int, default=8, help="Máximo de trabajadores del benchmark en paralelo")
+    parser.add_argument("--idioma", choices=sorted(CODIGOS_IDIOMA),
+                        help="Traduce en modo no interactivo al idioma indicado")
+    parser.add_argument("--entrada", default="-", help="Archivo de entrada (por defecto stdin)")
+    parser.add_argument("--salida", default="-", help="Archivo de salida (por defecto stdout)")
+    parser.add_argument("--jsonl", action="store_true", help="La entrada y la salida son registros JSONL")
+    parser.add_argument("--campo", default="frase", help="Campo JSONL con la frase a traducir")
+    parser.add_argument("--oracion", action="store_true",
+                        help="Traduce cada línea como oración (coincidencia más larga por frases)")
+    parser.add_argument("--lexicon", help="Lexicón binario a usar en lugar del diccionario incluido")
+    parser.add_argument("--construir-lexicon", metavar="TSV",
+                        help="Construye un lexicón binario (en --salida) a partir de un archivo TSV")
+    parser.add_argument("--lote", type=int, default=4096, help="Tamaño de lote para la traducción")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark()  # Ejecuta el benchmark en lugar del menú interactivo
+    elif args.benchmark_paralelo:
+        benchmark_paralelo(max_trabajadores=args.trabajadores)
+    elif args.construir_lexicon:
+        if args.salida == "-":
+            parser.error("--construir-lexicon requiere --salida")
+        total = construir_lexicon_tsv(args.construir_lexicon, args.salida)
+        print(f"Lexicón con {total} entradas escrito en {args.salida}")
+    elif args.idioma:
+        tabla = LexiconBinario(args.lexicon) if args.lexicon else None
+        traductor = crear_adaptador(CODIGOS_IDIOMA[args.idioma], tabla)
+        traducir_archivo(traductor, args.entrada, args.salida, args.jsonl, args.campo, args.lote,
+                         oraciones=args.oracion)
+    else:
+        menu()  # Llama al menú si el script se ejecuta directamente
@@ -0,0 +1,310 @@
+import argparse  # Opciones del benchmark desde la línea de comandos
+import cProfile  # Perfil opcional de cada caso
+import contextlib  # Silencia la salida de los módulos mientras se mide
+import importlib.util  # Carga los módulos de cada patrón desde su archivo
+import json  # Resultados y línea base en JSON
+import os  # Rutas de los módulos y de los archivos de salida
+import platform  # Datos del equipo donde se midió
+import pstats  # Resumen del perfil de cada caso
+import statistics  # Mediana de las repeticiones
+import sys  # Código de salida cuando hay regresiones
+import tempfile  # Archivos de entrada de los casos de importación
+import time  # Medición de tiempos
+import tracemalloc  # Memoria máxima y asignaciones de cada caso
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Carpeta con un directorio por patrón
+
+# Archivo de cada patrón
+MODULOS = {
+    "adapter": ("Adapter", "PatrónAdapter.py"),
+    "fabrica": ("AbtractFactory", "PatrónAbstractFactory.py"),
+    "observer": ("Observer", "PatrónObserver.py"),
+    "decorator": ("PDecorator", "Patróndecorator.py"),
+    "singleton": ("Singleton", "PatrónSingleton.py"),
+}
+
+_cargados = {}
+
+
+def cargar_modulo(clave):
+    # Importa (una sola vez) el módulo de un patrón; los menús solo corren con __main__
+    if clave not in _cargados:
+        carpeta, archivo = MODULOS[clave]
+        spec = importlib.util.spec_from_file_location(f"patron_{clave}", os.path.join(RAIZ, carpeta, archivo))
+        modulo = importlib.util.module_from_spec(spec)
+        with silenciar():
+            spec.loader.exec_module(modulo)
+        _cargados[clave] = modulo
+    return _cargados[clave]
+
+
+@contextlib.contextmanager
+def silenciar():
+    # Descarta lo que impriman los módulos (notificaciones, mensajes de conexión, etc.)
+    with open(os.devnull, "w", encoding="utf-8") as nulo, contextlib.redirect_stdout(nulo):
+        yield
+
+
+# Casos de benchmark
+# Cada caso recibe el tamaño n y devuelve (función a medir, operaciones por llamada,
+# función de limpieza o None). La preparación queda fuera de la medición.
+
+def caso_adapter_frase(n):
+    adapter = cargar_modulo("adapter")
+    traductor = adapter.crear_adaptador("Español")
+    frases = (["hello", "Goodbye", "THANK YOU", "good night", "unknown"] * (n // 5 + 1))[:n]
+
+    def medir():
+        traducir = traductor.traducir
+        for frase in frases:
+            traducir(frase)
+    return medir, n, None
+
+
+def caso_adapter_lote(n):
+    adapter = cargar_modulo("adapter")
+    traductor = adapter.crear_adaptador("Español")
+    frases = (["hello", "Goodbye", "THANK YOU", "good night", "unknown"] * (n // 5 + 1))[:n]
+    return (lambda: traductor.traducir_lote(frases)), n, None
+
+
+def caso_fabrica_lote(n):
+    fabrica = cargar_modulo("fabrica")
+    filas = [(f"Institución {i}", str(i % 5000 + 0.5)) for i in range(n)]
+    return (lambda: fabrica.FabricaPrivada().crear_lote(filas)), n, None
+
+
+def caso_fabrica_registro(n):
+    fabrica = cargar_modulo("fabrica")
+    filas = [("publica" if i % 2 else "privada", f"Institución {i}", i % 5000 + 0.5) for i in range(n)]
+
+    def medir():
+        registro = fabrica.RegistroInstituciones(":memory:")
+        registro.importar(filas)
+        registro.cerrar()
+    return medir, n, None
+
+
+def caso_observer_notificacion(n):
+    observer = cargar_modulo("observer")
+    evento = observer.EventoCalendario("Conferencia", "2025-04-10", "Auditorio")
+    participantes = [observer.Participante(f"Participante {i}") for i in range(n)]
+    for participante in participantes:
+        evento.agregar_observador(participante)
+    fechas = iter(range(1, 1 << 30))
+
+    def medir():
+        with silenciar():
+            evento.cambiar_evento(f"2025-05-{next(fechas)}", None)
+    return medir, n, None
+
+
+def caso_observer_importacion(n):
+    observer = cargar_modulo("observer")
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", encoding="utf-8", delete=False) as archivo:
+        archivo.write("nombre\n")
+        archivo.writelines(f"Asistente {i % (n - n // 20 or 1)}\n" for i in range(n))  # ~5% repetidos
+
+    def medir():
+        evento = observer.EventoCalendario("Conferencia", "2025-04-10", "Auditorio")
+        observer.importar_participantes(evento, archivo.name)
+    return medir, n, lambda: os.remove(archivo.name)
+
+
+def caso_decorator_cotizacion(n):
+    decorator = cargar_modulo("decorator")
+    pedidos = [{"plato": i % 4 + 1, "postre": i % 4, "bebida": i % 5, "extra": i % 4} for i in range(n)]
+
+    def medir():
+        menu = decorator.MenuRestaurante()  # Sin cotizaciones guardadas: se arma cada cadena una vez
+        for pedido in menu.cotizar_lote(pedidos):
+            pedido.costo()
+    return medir, n, None
+
+
+def caso_decorator_cadena(n):
+    decorator = cargar_modulo("decorator")
+    menu = decorator.MenuRestaurante()
+    combinaciones = [(i % 4 + 1, i % 4, i % 5, i % 4) for i in range(n)]
+
+    def medir():
+        for plato, postre, bebida, extra in combinaciones:
+            menu.armar_pedido(plato, postre, bebida, extra).costo()  # Recorre la cadena de decoradores
+    return medir, n, None
+
+
+def caso_decorator_almacen(n):
+    decorator = cargar_modulo("decorator")
+    almacen = decorator.AlmacenPedidos(decorator.MenuRestaurante())
+    almacen.extender((i % 4 + 1, i % 4, i % 5, i % 4) for i in range(n))
+    return (lambda: almacen.totales({"bebida": {3: 4000}})), n, None
+
+
+def caso_singleton_instancia(n):
+    singleton = cargar_modulo("singleton")
+
+    def medir():
+        clase = singleton.DatabaseConnection
+        for _ in range(n):
+            clase().status()
+    return medir, n, None
+
+
+def caso_singleton_consultas(n):
+    singleton = cargar_modulo("singleton")
+    db = singleton.DatabaseConnection()
+    with silenciar():
+        db.connect()
+    db.ejecutar("CREATE TABLE IF NOT EXISTS benchmark (id INTEGER PRIMARY KEY, valor TEXT)")
+
+    def medir():
+        for i in range(n):
+            db.escribir("INSERT OR REPLACE INTO benchmark (id, valor) VALUES (?, ?)", (i, "x"))
+        db.vaciar()
+        db.ejecutar("SELECT COUNT(*) FROM benchmark")
+
+    def limpiar():
+        with silenciar():
+            db.disconnect()
+    return medir, n, limpiar
+
+
+# Nombre -> (función del caso, tamaño base); el tamaño real es base * escala
+CASOS = {
+    "adapter.traduccion_frase": (caso_adapter_frase, 200_000),
+    "adapter.traduccion_lote": (caso_adapter_lote, 200_000),
+    "fabrica.crear_lote": (caso_fabrica_lote, 100_000),
+    "fabrica.registro_importar": (caso_fabrica_registro, 50_000),
+    "observer.notificacion": (caso_observer_notificacion, 50_000),
+    "observer.importacion": (caso_observer_importacion, 100_000),
+    "decorator.cotizacion_lote": (caso_decorator_cotizacion, 200_000),
+    "decorator.cadena": (caso_decorator_cadena, 50_000),
+    "decorator.almacen_totales": (caso_decorator_almacen, 500_000),
+    "singleton.instancia": (caso_singleton_instancia, 500_000),
+    "singleton.escrituras_lote": (caso_singleton_consultas, 50_000),
+}
+
+
+def ejecutar_caso(nombre, escala=1.0, repeticiones=5, memoria=True, perfil=None, asignaciones=0):
+    # Mide un caso: tiempos de cada repetición, rendimiento, memoria máxima y, si se pide, perfil
+    funcion_caso, base = CASOS[nombre]
+    n = max(1, int(base * escala))
+    with silenciar():
+        medir, operaciones, limpiar = funcion_caso(n)
+    try:
+        with silenciar():
+            medir()  # Calentamiento: cachés, instancias, conexiones, etc.
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            medir()
+            tiempos.append(time.perf_counter() - inicio)
+        mediana = statistics.median(tiempos)
+        resultado = {
+            "n": n,
+            "repeticiones": repeticiones,
+            "tiempo_mediana_s": mediana,
+            "tiempo_min_s": min(tiempos),
+            "tiempo_max_s": max(tiempos),
+            "latencia_op_us": mediana / operaciones * 1e6,
+            "operaciones_por_segundo": operaciones / mediana,
+        }
+        if memoria or asignaciones:
+            # Pasada aparte: tracemalloc hace mucho más lento el código medido
+            tracemalloc.start()
+            medir()
+            instantanea = tracemalloc.take_snapshot() if asignaciones else None
+            resultado["memoria_pico_bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            if instantanea is not None:
+                resultado["asignaciones"] = [
+                    {"lugar": str(estadistica.traceback), "bytes": estadistica.size, "bloques": estadistica.count}
+                    for estadistica in instantanea.statistics("lineno")[:asignaciones]]
+        if perfil:
+            os.makedirs(perfil, exist_ok=True)
+            perfilador = cProfile.Profile()
+            perfilador.runcall(medir)
+            ruta = os.path.join(perfil, f"{nombre}.prof")
+            perfilador.dump_stats(ruta)
+            with open(os.path.join(perfil, f"{nombre}.txt"), "w", encoding="utf-8") as archivo:
+                pstats.Stats(ruta, stream=archivo).sort_stats("cumulative").print_stats(25)
+            resultado["perfil"] = ruta
+    finally:
+        if limpiar is not None:
+            limpiar()
+    return resultado
+
+
+def comparar(resultados, base, tolerancia=0.10):
+    # Lista de regresiones: menos rendimiento o más memoria que la línea base, más allá de la tolerancia
+    regresiones = []
+    for nombre, actual in resultados.items():
+        anterior = base.get(nombre)
+        if anterior is None or anterior.get("n") != actual["n"]:
+            continue  # Caso nuevo o medido con otro tamaño: no se puede comparar
+        cambio = actual["operaciones_por_segundo"] / anterior["operaciones_por_segundo"] - 1
+        actual["cambio_rendimiento"] = cambio
+        if cambio < -tolerancia:
+            regresiones.append(f"{nombre}: rendimiento {cambio:+.1%}")
+        if "memoria_pico_bytes" in actual and anterior.get("memoria_pico_bytes"):
+            cambio = actual["memoria_pico_bytes"] / anterior["memoria_pico_bytes"] - 1
+            actual["cambio_memoria"] = cambio
+            if cambio > tolerancia:
+                regresiones.append(f"{nombre}: memoria pico {cambio:+.1%}")
+    return regresiones
+
+
+def ejecutar(casos=None, escala=1.0, repeticiones=5, memoria=True, perfil=None, asignaciones=0):
+    # Ejecuta los casos pedidos (por nombre o prefijo, p. ej. "observer") y devuelve sus resultados
+    seleccion = [nombre for nombre in CASOS
+                 if not casos or any(nombre == c or nombre.startswith(c + ".") for c in casos)]
+    if not seleccion:
+        raise ValueError(f"Ningún caso coincide con {casos}; disponibles: {', '.join(CASOS)}")
+    resultados = {}
+    for nombre in seleccion:
+        resultados[nombre] = ejecutar_caso(nombre, escala, repeticiones, memoria, perfil, asignaciones)
+        r = resultados[nombre]
+        memoria_texto = f" | pico {r['memoria_pico_bytes'] / 1e6:,.1f} MB" if "memoria_pico_bytes" in r else ""
+        print(f"{nombre}: {r['operaciones_por_segundo']:,.0f} op/s | "
+              f"{r['latencia_op_us']:.2f} µs/op{memoria_texto}", file=sys.stderr)
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark sin interacción de los cinco patrones")
+    parser.add_argument("casos", nargs="*", help=f"Casos o módulos a medir (por defecto todos): {', '.join(CASOS)}")
+    parser.add_argument("--escala", type=float, default=1.0, help="Multiplica el tamaño de entrada de cada caso")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Repeticiones medidas por caso")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados (por defecto stdout)")
+    parser.add_argument("--base", help="JSON de una ejecución anterior con el que comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.10,
+                        help="Empeoramiento permitido respecto de la base antes de marcar regresión (0.10 = 10%%)")
+    parser.add_argument("--sin-memoria", action="store_true", help="No mide la memoria pico (más rápido)")
+    parser.add_argument("--perfil", metavar="DIRECTORIO", help="Guarda un perfil cProfile (.prof y .txt) por caso")
+    parser.add_argument("--asignaciones", type=int, default=0, metavar="N",
+                        help="Incluye las N líneas que más memoria dejan asignada en cada caso (tracemalloc)")
+    args = parser.parse_args()
+
+    resultados = ejecutar(args.casos, args.escala, args.repeticiones, not args.sin_memoria,
+                          args.perfil, args.asignaciones)
+    regresiones = []
+    if args.base:
+        with open(args.base, "r", encoding="utf-8") as archivo:
+            regresiones = comparar(resultados, json.load(archivo)["resultados"], args.tolerancia)
+    informe = {
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "escala": args.escala,
+        "resultados": resultados,
+        "regresiones": regresiones,
+    }
+    texto = json.dumps(informe, ensure_ascii=False, indent=2)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            archivo.write(texto + "\n")
+    else:
+        print(texto)
+    for regresion in regresiones:
+        print(f"⚠️ Regresión: {regresion}", file=sys.stderr)
+    sys.exit(1 if regresiones else 0)
@@ -1,57 +1,833 @@
+import bisect  # Índices ordenados por fecha del calendario
+import csv  # Importación de participantes desde CSV
+import json  # Formato de los registros del log de cambios
+import mmap  # Lectura secuencial rápida del log de cambios
+import os  # Archivos y fsync del log de cambios
+import struct  # Cabecera binaria de cada registro del log
+import sys  # Se usa para escribir las notificaciones por lotes
+import threading  # Hilo propio del despachador y protección de las métricas
+import time  # Medición de latencias de entrega
+import weakref  # Permite suscribir observadores sin mantenerlos vivos
+import zlib  # CRC32 para detectar registros incompletos en el log
 from abc import ABC, abstractmethod  # Se importa herramientas para clases abstractas
+from array import array  # Índice de posiciones de cada segmento del log
+from collections import deque  # Últimas latencias medidas por el despachador
+from itertools import islice  # Suscripción de participantes por bloques
+from contextlib import contextmanager  # Agrupación de cambios con "with"
+from datetime import date, datetime, timedelta  # Fechas de los eventos del calendario
+from types import MappingProxyType  # Diferencias de solo lectura en cada notificación
+# asyncio y concurrent.futures se importan recién al crear un DespachadorNotificaciones:
+# cargarlos tarda más que todo el resto del módulo y muchos usos no los necesitan
+
+# Lo que se puede importar desde otros módulos
+__all__ = ["Observador", "Participante", "texto_cambios", "CambioEvento", "DespachadorNotificaciones",
+           "CambioRegistrado",
+           "RegistroCambios", "EventoCalendario", "leer_participantes", "importar_participantes",
+           "convertir_fecha", "Calendario", "benchmark_arranque", "benchmark_importacion"]
 
 # Clase abstracta del observador
 class Observador(ABC):
+    __slots__ = ()  # Permite que Participante no tenga __dict__; las demás subclases lo siguen teniendo
+
     @abstractmethod
     def actualizar(self, evento):
         pass  # Método que será implementado por los observadores concretos
 
+    @classmethod
+    def actualizar_lote(cls, observadores, evento):
+        # Notifica a varios observadores de esta clase; las subclases pueden hacerlo de forma más eficiente
+        for observador in observadores:
+            observador.actualizar(evento)
+
 # Clase concreta del observador
 class Participante(Observador):
+    __slots__ = ("nombre", "__weakref__")  # Sin __dict__: ocupa mucho menos con cientos de miles de participantes
+
     def __init__(self, nombre):
         self.nombre = nombre  # Guarda el nombre del participante
 
     def actualizar(self, evento):
         # Notificación al participante cuando el evento cambia
-        print(f"[{self.nombre}] Notificado: El evento '{evento.nombre}' ha sido actualizado.")
+        print(f"[{self.nombre}] Notificado: El evento '{evento.nombre}' ha sido actualizado"
+              f"{texto_cambios(evento)}.")
+
+    @classmethod
+    def actualizar_lote(cls, observadores, evento):
+        # Arma todas las notificaciones del lote y las escribe de una sola vez
+        mensaje = f"Notificado: El evento '{evento.nombre}' ha sido actualizado{texto_cambios(evento)}.\n"
+        sys.stdout.write("".join(f"[{p.nombre}] {mensaje}" for p in observadores))
+
+def texto_cambios(evento):
+    # Resume el cambio notificado, p. ej. " (fecha: 2025-04-10 → 2025-04-12)"
+    cambios = getattr(evento, "cambios", None)
+    if not cambios:
+        return ""
+    return " (" + ", ".join(f"{campo}: {antes} → {despues}" for campo, (antes, despues) in cambios.items()) + ")"
+
+def admite_lote(clase):
+    # actualizar_lote solo sirve si fue escrito para el actualizar que tiene la clase: una subclase
+    # que redefine solo actualizar hereda un actualizar_lote que no lo llamaría
+    for base in clase.__mro__:
+        if "actualizar_lote" in vars(base):
+            return base is clase or getattr(clase, "actualizar", None) is getattr(base, "actualizar", None)
+    return False  # Observadores que no heredan de Observador
+
+# Foto de un evento en el momento de notificar
+# Es lo que reciben los observadores en actualizar(): los valores y la diferencia de ese
+# cambio, de solo lectura. Así una entrega tardía (con despachador o con espera de
+# agrupación) no ve los cambios que el evento tuvo después.
+class CambioEvento:
+    __slots__ = ("evento", "nombre", "fecha", "lugar", "cambios")
+
+    def __init__(self, evento, nombre, fecha, lugar, cambios=None):
+        asignar = object.__setattr__
+        asignar(self, "evento", evento)  # EventoCalendario de origen (None si viene del log)
+        asignar(self, "nombre", nombre)
+        asignar(self, "fecha", fecha)
+        asignar(self, "lugar", lugar)
+        asignar(self, "cambios", MappingProxyType(dict(cambios or {})))  # campo -> (valor anterior, valor nuevo)
+
+    def __setattr__(self, atributo, valor):
+        raise AttributeError(f"{type(self).__name__} es de solo lectura")
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.nombre!r}, fecha={self.fecha!r}, lugar={self.lugar!r}{texto_cambios(self)})"
+
+# Despachador de notificaciones en paralelo
+# Entrega las notificaciones en segundo plano desde un bucle asyncio propio: los
+# observadores con "async def actualizar" se esperan en el bucle y los síncronos se
+# ejecutan en un grupo de hilos. La concurrencia está acotada, cada entrega tiene un
+# tiempo límite y el error de un observador no afecta a los demás.
+class DespachadorNotificaciones:
+    def __init__(self, max_concurrencia=100, max_hilos=32, tiempo_limite=5.0, muestras_latencia=100_000):
+        self.max_concurrencia = max_concurrencia  # Entregas en curso a la vez, por difusión
+        self.tiempo_limite = tiempo_limite  # Segundos máximos por observador (None = sin límite)
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor  # Entrega a observadores síncronos en paralelo
+        self._hilos = ThreadPoolExecutor(max_hilos)
+        # Un hilo libre por entrega síncrona en curso: el tiempo límite corre recién cuando empieza
+        # a ejecutarse y no incluye la espera en la cola del grupo de hilos
+        self._hilos_libres = asyncio.Semaphore(max_hilos)
+        self._bucle = asyncio.new_event_loop()
+        self._hilo = threading.Thread(target=self._bucle.run_forever, daemon=True)
+        self._hilo.start()
+        self._pendientes = set()  # Difusiones aún en curso
+        self._lock = threading.Lock()
+        self._latencias = deque(maxlen=muestras_latencia)  # Segundos desde enviar() hasta la entrega
+        self.entregadas = 0
+        self.fallidas = 0
+        self.expiradas = 0
+        self.errores = deque(maxlen=100)  # Últimos (observador, excepción) fallidos
+
+    def enviar(self, evento, observadores):
+        # Programa la difusión y vuelve de inmediato; devuelve un Future que termina al completarla
+        import asyncio
+        futuro = asyncio.run_coroutine_threadsafe(
+            self._difundir(evento, list(observadores), time.perf_counter()), self._bucle)
+        with self._lock:
+            self._pendientes.add(futuro)
+        futuro.add_done_callback(self._terminado)
+        return futuro
+
+    def _terminado(self, futuro):
+        with self._lock:
+            self._pendientes.discard(futuro)
+
+    async def _difundir(self, evento, observadores, enviado):
+        # Concurrencia acotada: 'max_concurrencia' trabajadores toman observadores de un iterador común
+        import asyncio
+        pendientes = iter(observadores)
+
+        async def trabajador():
+            for observador in pendientes:
+                await self._entregar(observador, evento, enviado)
+
+        await asyncio.gather(*(trabajador() for _ in range(min(self.max_concurrencia, len(observadores)))))
+
+    async def _entregar(self, observador, evento, enviado):
+        import asyncio
+        try:
+            if asyncio.iscoroutinefunction(observador.actualizar):
+                await asyncio.wait_for(observador.actualizar(evento), self.tiempo_limite)
+            else:
+                await self._hilos_libres.acquire()
+                tarea = self._bucle.run_in_executor(self._hilos, observador.actualizar, evento)
+                # El hilo se libera cuando termina de verdad, aunque la entrega ya haya expirado
+                tarea.add_done_callback(lambda _: self._hilos_libres.release())
+                await asyncio.wait_for(asyncio.shield(tarea), self.tiempo_limite)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.expiradas += 1
+        except Exception as error:  # Aislamiento de fallos: se registra y se sigue con los demás
+            with self._lock:
+                self.fallidas += 1
+                self.errores.append((observador, error))
+        else:
+            with self._lock:
+                self.entregadas += 1
+                self._latencias.append(time.perf_counter() - enviado)
+
+    def esperar(self, tiempo_limite=None):
+        # Bloquea hasta que terminen las difusiones en curso
+        with self._lock:
+            pendientes = list(self._pendientes)
+        for futuro in pendientes:
+            futuro.result(tiempo_limite)
+
+    def metricas(self):
+        # Contadores y percentiles de latencia de entrega (en milisegundos)
+        with self._lock:
+            latencias = sorted(self._latencias)
+            resultado = {"entregadas": self.entregadas, "fallidas": self.fallidas,
+                         "expiradas": self.expiradas, "en_curso": len(self._pendientes)}
+        if latencias:
+            def percentil(p):
+                return latencias[min(len(latencias) - 1, int(p * len(latencias)))] * 1000
+            resultado.update({"latencia_media_ms": sum(latencias) / len(latencias) * 1000,
+                              "latencia_p50_ms": percentil(0.50), "latencia_p95_ms": percentil(0.95),
+                              "latencia_p99_ms": percentil(0.99), "latencia_max_ms": latencias[-1] * 1000})
+        return resultado
+
+    def cerrar(self):
+        self.esperar()
+        self._bucle.call_soon_threadsafe(self._bucle.stop)
+        self._hilo.join()
+        self._bucle.close()
+        self._hilos.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
+
+# Log de cambios persistente
+# Guarda cada cambio de un evento en archivos de solo escritura al final
+# ("segmentos"), con un índice de posiciones por segmento. Cada registro se pasa
+# al sistema operativo antes de notificar (sobrevive a una caída del proceso) y el
+# fsync se hace por lotes: cada 'lote_fsync' registros o, desde un hilo propio,
+# cuando pasan 'intervalo_fsync' segundos con registros sin sincronizar.
+# Cada consumidor guarda el último offset que confirmó (los cambios notificados en
+# vivo también traen su offset), así después de una caída se le reenvía solo lo
+# pendiente (entrega al menos una vez).
+
+def a_json(valor):
+    # Valores que json no sabe escribir (fechas y otros objetos) se guardan como texto
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    return str(valor)
+
+class CambioRegistrado(CambioEvento):
+    # Cambio guardado en el log: lo reciben los observadores de un evento con registro_cambios
+    # (en vivo) y los consumidores al reenviarles lo pendiente. Con 'offset' se confirma.
+    __slots__ = ("offset",)
+
+    def __init__(self, offset, evento, nombre, fecha, lugar, cambios=None):
+        super().__init__(evento, nombre, fecha, lugar, cambios)
+        object.__setattr__(self, "offset", offset)
+
+    @classmethod
+    def desde_log(cls, offset, datos):
+        # Cambio leído del log (sin el EventoCalendario de origen)
+        return cls(offset, None, datos["evento"], datos["fecha"], datos["lugar"],
+                   {campo: tuple(valores) for campo, valores in datos["cambios"].items()})
+
+class RegistroCambios:
+    CABECERA = struct.Struct("<QII")  # offset, longitud de los datos, CRC32 de los datos
+
+    def __init__(self, directorio, tamano_segmento=64 << 20, lote_fsync=1000, intervalo_fsync=0.05):
+        self.directorio = directorio
+        self.tamano_segmento = tamano_segmento  # Bytes a partir de los cuales se abre un segmento nuevo
+        self.lote_fsync = lote_fsync
+        self.intervalo_fsync = intervalo_fsync
+        self._lock = threading.RLock()
+        os.makedirs(directorio, exist_ok=True)
+        self._segmentos = sorted(int(nombre[:-4]) for nombre in os.listdir(directorio) if nombre.endswith(".log"))
+        if not self._segmentos:
+            self._segmentos = [0]
+        self._pendientes = 0  # Registros escritos desde el último fsync
+        self._ultimo_fsync = time.monotonic()
+        self._abrir_ultimo_segmento()
+        self._ruta_consumidores = os.path.join(directorio, "consumidores.json")
+        try:
+            with open(self._ruta_consumidores, "r", encoding="utf-8") as archivo:
+                self._consumidores = json.load(archivo)
+        except FileNotFoundError:
+            self._consumidores = {}
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._sincronizar_periodicamente, daemon=True)
+        self._hilo.start()
+
+    def _ruta(self, base, extension):
+        return os.path.join(self.directorio, f"{base:020d}.{extension}")
+
+    def _abrir_ultimo_segmento(self):
+        # Recorre el último segmento, descarta un posible registro incompleto del final y rehace su índice
+        base = self._segmentos[-1]
+        ruta = self._ruta(base, "log")
+        with open(ruta, "ab+") as archivo:
+            archivo.seek(0)
+            datos = archivo.read()
+            posiciones = array("Q")
+            posicion, siguiente = 0, base
+            while posicion + self.CABECERA.size <= len(datos):
+                offset, longitud, crc = self.CABECERA.unpack_from(datos, posicion)
+                fin = posicion + self.CABECERA.size + longitud
+                if offset != siguiente or fin > len(datos) or zlib.crc32(datos[fin - longitud:fin]) != crc:
+                    break
+                posiciones.append(posicion)
+                posicion, siguiente = fin, siguiente + 1
+            archivo.truncate(posicion)
+        with open(self._ruta(base, "idx"), "wb") as indice:
+            indice.write(posiciones.tobytes())
+        self._log = open(ruta, "ab")
+        self._indice = open(self._ruta(base, "idx"), "ab")
+        self._tamano = posicion
+        self._siguiente = siguiente
+
+    def agregar(self, datos):
+        # Agrega un registro (diccionario JSON) al final del log y devuelve su offset
+        contenido = json.dumps(datos, ensure_ascii=False, default=a_json).encode("utf-8")
+        with self._lock:
+            if self._tamano >= self.tamano_segmento:
+                self._nuevo_segmento()
+            offset = self._siguiente
+            self._log.write(self.CABECERA.pack(offset, len(contenido), zlib.crc32(contenido)))
+            self._log.write(contenido)
+            self._indice.write(struct.pack("<Q", self._tamano))
+            self._tamano += self.CABECERA.size + len(contenido)
+            self._siguiente += 1
+            self._pendientes += 1
+            if self._pendientes >= self.lote_fsync:
+                self.sincronizar()
+            else:
+                self._log.flush()  # Al menos en el sistema operativo antes de que se notifique
+            return offset
+
+    def _nuevo_segmento(self):
+        self.sincronizar()
+        os.fsync(self._indice.fileno())
+        self._log.close()
+        self._indice.close()
+        self._segmentos.append(self._siguiente)
+        self._log = open(self._ruta(self._siguiente, "log"), "ab")
+        self._indice = open(self._ruta(self._siguiente, "idx"), "ab")
+        self._tamano = 0
+
+    def sincronizar(self):
+        # Vuelca los registros pendientes al disco (fsync); el índice se puede rehacer, solo se vacía
+        with self._lock:
+            self._log.flush()
+            self._indice.flush()
+            if self._pendientes:
+                os.fsync(self._log.fileno())
+            self._pendientes = 0
+            self._ultimo_fsync = time.monotonic()
+
+    def _sincronizar_periodicamente(self):
+        # El final de una ráfaga no espera a la próxima escritura para llegar al disco
+        while not self._detener.wait(self.intervalo_fsync):
+            with self._lock:
+                if (self._pendientes and not self._log.closed
+                        and time.monotonic() - self._ultimo_fsync >= self.intervalo_fsync):
+                    self.sincronizar()
+
+    @property
+    def siguiente_offset(self):
+        return self._siguiente
+
+    def leer_desde(self, offset=0):
+        # Genera (offset, datos) desde el offset indicado, leyendo los segmentos con mmap en orden
+        with self._lock:
+            self._log.flush()
+            self._indice.flush()
+            segmentos = list(self._segmentos)
+            limite = self._siguiente
+        offset = max(offset, segmentos[0])
+        primero = max(bisect.bisect_right(segmentos, offset) - 1, 0)
+        for numero, base in enumerate(segmentos[primero:], primero):
+            fin_segmento = segmentos[numero + 1] if numero + 1 < len(segmentos) else limite
+            if offset >= fin_segmento:
+                continue
+            with open(self._ruta(base, "idx"), "rb") as indice:
+                indice.seek(8 * (offset - base))
+                posicion = struct.unpack("<Q", indice.read(8))[0]
+            with open(self._ruta(base, "log"), "rb") as archivo, \
+                    mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+                while offset < fin_segmento:
+                    actual, longitud, _ = self.CABECERA.unpack_from(datos, posicion)
+                    inicio = posicion + self.CABECERA.size
+                    posicion = inicio + longitud
+                    yield actual, json.loads(datos[inicio:posicion])
+                    offset += 1
+
+    # --- Consumidores ---
+
+    def confirmado(self, consumidor):
+        # Último offset confirmado por el consumidor (-1 si nunca confirmó)
+        return self._consumidores.get(consumidor, -1)
+
+    def confirmar(self, consumidor, offset):
+        # Guarda de forma atómica (archivo temporal + os.replace) el último offset procesado
+        with self._lock:
+            self._consumidores[consumidor] = max(offset, self.confirmado(consumidor))
+            temporal = self._ruta_consumidores + ".tmp"
+            with open(temporal, "w", encoding="utf-8") as archivo:
+                json.dump(self._consumidores, archivo)
+                archivo.flush()
+                os.fsync(archivo.fileno())
+            os.replace(temporal, self._ruta_consumidores)
+
+    def entregar_pendientes(self, consumidor, observador, tamano_lote=1000):
+        # Reenvía al observador los cambios que aún no confirmó, confirmando cada 'tamano_lote'
+        entregados, ultimo = 0, None
+        for offset, datos in self.leer_desde(self.confirmado(consumidor) + 1):
+            observador.actualizar(CambioRegistrado.desde_log(offset, datos))
+            entregados, ultimo = entregados + 1, offset
+            if entregados % tamano_lote == 0:
+                self.confirmar(consumidor, ultimo)
+        if ultimo is not None:
+            self.confirmar(consumidor, ultimo)
+        return entregados
+
+    def cerrar(self):
+        self._detener.set()
+        self._hilo.join()
+        with self._lock:
+            self.sincronizar()
+            self._log.close()
+            self._indice.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
 
 # Clase del sujeto (Subject)
 class EventoCalendario:
-    def __init__(self, nombre, fecha, lugar):
+    CAMPOS = ("fecha", "lugar")  # Campos que pueden cambiar y a los que se puede suscribir
+
+    def __init__(self, nombre, fecha, lugar, referencias_debiles=False, despachador=None,
+                 espera_agrupacion=None, registro_cambios=None):
         self.nombre = nombre
         self.fecha = fecha
         self.lugar = lugar
-        self.observadores = []  # Lista de participantes (observadores)
+        self.registro_cambios = registro_cambios  # RegistroCambios donde se guarda cada cambio antes de notificarlo
+        self.validar_fecha = None  # Función que recibe la nueva fecha y lanza ValueError si no se acepta
+        self.despachador = despachador  # Si se indica, las notificaciones se entregan en segundo plano
+        # Observadores indexados por identidad (el diccionario conserva el orden de suscripción),
+        # así agregar y quitar cuestan O(1). Con referencias_debiles=True se guardan weakref y los
+        # participantes que ya nadie usa se eliminan solos.
+        self._observadores = {}
+        self._campos = {}  # id del observador -> campos que le interesan (si no está, le interesan todos)
+        self.referencias_debiles = referencias_debiles
+        # Agrupación de cambios: los cambios seguidos se juntan en una sola notificación con
+        # el valor anterior y el nuevo de cada campo; los cambios que no cambian nada no se notifican
+        self.espera_agrupacion = espera_agrupacion  # Segundos de espera antes de notificar (None = al instante)
+        self._originales = {}  # Valor de cada campo antes del primer cambio aún sin notificar
+        self._agrupando = 0  # Bloques "with agrupar_cambios()" abiertos
+        self._temporizador = None
+        self._lock_cambios = threading.RLock()
+        self.errores = deque(maxlen=100)  # Últimos (observador o lote, excepción) que fallaron al notificar
+
+    @property
+    def observadores(self):
+        # Lista (copia) de los observadores vivos, en orden de suscripción
+        return list(self._vivos())
+
+    def _vivos(self, campos=None):
+        # Observadores vivos; si se indican campos, solo los suscritos a alguno de ellos
+        filtrar = campos is not None and bool(self._campos)
+        if self.referencias_debiles:
+            pares = [(clave, ref()) for clave, ref in self._observadores.items()]
+            pares = [(clave, obs) for clave, obs in pares if obs is not None]
+        elif not filtrar:
+            return self._observadores.values()
+        else:
+            pares = self._observadores.items()
+        if not filtrar:
+            return [obs for _, obs in pares]
+        filtros = self._campos
+        return [obs for clave, obs in pares if clave not in filtros or not filtros[clave].isdisjoint(campos)]
+
+    def agregar_observador(self, observador, campos=None):
+        # 'campos' limita las notificaciones a cambios de esos campos (p. ej. {"lugar"})
+        clave = id(observador)
+        if campos is not None:
+            campos = frozenset(campos)
+            desconocidos = campos.difference(self.CAMPOS)
+            if desconocidos:
+                raise ValueError(f"Campos desconocidos: {', '.join(sorted(desconocidos))}")
+            self._campos[clave] = campos
+        else:
+            self._campos.pop(clave, None)
+        if self.referencias_debiles:
+            self._observadores[clave] = self._referencia(observador, clave)
+        else:
+            self._observadores[clave] = observador  # Añade un observador (si ya estaba, no se duplica)
+
+    def _referencia(self, observador, clave):
+        # Referencia débil que quita al observador de los registros cuando se libera
+        observadores = self._observadores
+        filtros = self._campos
+
+        def al_liberar(ref, clave=clave):
+            if observadores.get(clave) is ref:  # El id pudo reutilizarse para otro observador
+                del observadores[clave]
+                filtros.pop(clave, None)
+
+        return weakref.ref(observador, al_liberar)
 
-    def agregar_observador(self, observador):
-        self.observadores.append(observador)  # Añade un observador a la lista
+    def agregar_observadores(self, observadores, campos=None, tamano_bloque=10_000):
+        # Suscribe muchos observadores (cualquier iterable, también un generador) por bloques:
+        # cada bloque entra con una sola actualización del registro. Devuelve cuántos eran nuevos.
+        if campos is not None:
+            campos = frozenset(campos)
+            desconocidos = campos.difference(self.CAMPOS)
+            if desconocidos:
+                raise ValueError(f"Campos desconocidos: {', '.join(sorted(desconocidos))}")
+        registro = self._observadores
+        filtros = self._campos
+        nuevos = 0  # Se cuentan al insertar: len(registro) cambia si se libera un observador débil
+        iterador = iter(observadores)
+        while True:
+            bloque = [(id(observador), observador) for observador in islice(iterador, tamano_bloque)]
+            if not bloque:
+                break
+            with self._lock_cambios:  # Un cambio no se publica con un bloque a medio insertar
+                nuevos += len({clave for clave, _ in bloque if clave not in registro})
+                if self.referencias_debiles:
+                    registro.update((clave, self._referencia(observador, clave)) for clave, observador in bloque)
+                else:
+                    registro.update(bloque)
+                if campos is not None:
+                    filtros.update((clave, campos) for clave, _ in bloque)
+                elif filtros:
+                    for clave, _ in bloque:
+                        filtros.pop(clave, None)
+        return nuevos
 
     def quitar_observador(self, observador):
-        self.observadores.remove(observador)  # Elimina un observador de la lista
+        # Elimina un observador; lanza ValueError si no estaba suscrito (como list.remove)
+        if self._observadores.pop(id(observador), None) is None:
+            raise ValueError("El observador no está suscrito a este evento")
+        self._campos.pop(id(observador), None)
 
-    def notificar(self):
-        # Notifica a todos los observadores registrados
-        for observador in self.observadores:
-            observador.actualizar(self)
+    def __len__(self):
+        return len(self._observadores)
+
+    def instantanea(self, cambios=None, offset=None):
+        # Foto de solo lectura del evento (con la diferencia indicada) para entregar a los observadores;
+        # con 'offset' es un CambioRegistrado, que el observador puede confirmar en el registro de cambios
+        if offset is not None:
+            return CambioRegistrado(offset, self, self.nombre, self.fecha, self.lugar, cambios)
+        return CambioEvento(self, self.nombre, self.fecha, self.lugar, cambios)
+
+    def notificar(self, tamano_lote=1000, campos=None, cambio=None):
+        # Notifica a todos los observadores registrados (o solo a los interesados en 'campos').
+        # Cada observador recibe 'cambio' (por defecto, una foto actual del evento sin diferencias).
+        # Se agrupan por clase y cada grupo se entrega con actualizar_lote en bloques de
+        # 'tamano_lote' (p. ej. una sola escritura por bloque).
+        # Con despachador, la entrega se hace en segundo plano y se devuelve el Future de la difusión.
+        evento = cambio if cambio is not None else self.instantanea()
+        if self.despachador is not None:
+            return self.despachador.enviar(evento, self._vivos(campos))
+        grupos = {}
+        por_lote = {}  # Clase -> si se le puede entregar con actualizar_lote
+        for observador in list(self._vivos(campos)):  # Copia: un observador puede desuscribirse al ser notificado
+            clase = type(observador)
+            admite = por_lote.get(clase)
+            if admite is None:
+                admite = por_lote[clase] = admite_lote(clase)
+            if not admite:
+                self._entregar(observador.actualizar, evento, observador)
+                continue
+            grupo = grupos.setdefault(clase, [])
+            grupo.append(observador)
+            if len(grupo) >= tamano_lote:
+                self._entregar(clase.actualizar_lote, evento, grupo, grupo)
+                grupos[clase] = []
+        for clase, grupo in grupos.items():
+            if grupo:
+                self._entregar(clase.actualizar_lote, evento, grupo, grupo)
+
+    def _entregar(self, funcion, evento, destino, grupo=None):
+        # El error de un observador (o de un lote) se registra y no corta la difusión a los demás
+        try:
+            funcion(grupo, evento) if grupo is not None else funcion(evento)
+        except Exception as error:
+            self.errores.append((destino, error))
+            print(f"⚠️ Falló la notificación a {getattr(destino, 'nombre', type(destino).__name__)}: {error}")
 
     def cambiar_evento(self, nueva_fecha=None, nuevo_lugar=None):
-        # Permite actualizar la fecha y/o el lugar del evento
-        if nueva_fecha:
-            self.fecha = nueva_fecha
-        if nuevo_lugar:
-            self.lugar = nuevo_lugar
-        print(f"\n🔔 Evento '{self.nombre}' actualizado.")
-        self.notificar()  # Notifica a los observadores del cambio
+        # Permite actualizar la fecha y/o el lugar del evento. La notificación sale al instante,
+        # al cerrar un bloque agrupar_cambios() o tras 'espera_agrupacion' segundos sin más cambios
+        with self._lock_cambios:
+            if nueva_fecha and self.validar_fecha is not None:
+                self.validar_fecha(nueva_fecha)  # Se rechaza antes de modificar nada
+            for campo, valor in (("fecha", nueva_fecha), ("lugar", nuevo_lugar)):
+                if valor and valor != getattr(self, campo):
+                    self._originales.setdefault(campo, getattr(self, campo))
+                    setattr(self, campo, valor)
+            if self._agrupando:
+                return None
+            if self.espera_agrupacion is not None:
+                if self._temporizador is not None:
+                    self._temporizador.cancel()  # Cada cambio reinicia la espera
+                self._temporizador = threading.Timer(self.espera_agrupacion, self.publicar_cambios)
+                self._temporizador.daemon = True
+                self._temporizador.start()
+                return None
+        return self.publicar_cambios()
+
+    def publicar_cambios(self):
+        # Notifica ya los cambios pendientes (si los hay) con su diferencia anterior → nuevo
+        with self._lock_cambios:
+            if self._temporizador is not None:
+                self._temporizador.cancel()
+                self._temporizador = None
+            cambios = {campo: (antes, getattr(self, campo)) for campo, antes in self._originales.items()
+                       if antes != getattr(self, campo)}  # Un campo que volvió a su valor no cuenta
+            self._originales = {}
+            if not cambios:
+                return None
+            offset = None
+            if self.registro_cambios is not None:
+                try:
+                    offset = self.registro_cambios.agregar({"evento": self.nombre, "fecha": self.fecha,
+                                                            "lugar": self.lugar, "cambios": cambios})
+                except Exception:
+                    # Sin registro no se notifica: el cambio queda pendiente para el próximo intento
+                    self._originales = {campo: antes for campo, (antes, _) in cambios.items()}
+                    raise
+            cambio = self.instantanea(cambios, offset)  # Con el offset del log, si hay registro
+            print(f"\n🔔 Evento '{self.nombre}' actualizado.")
+            return self.notificar(campos=cambios.keys(), cambio=cambio)  # Notifica a los observadores del cambio
+
+    @contextmanager
+    def agrupar_cambios(self):
+        # Dentro del bloque los cambios se acumulan y al salir se envía una sola notificación
+        with self._lock_cambios:
+            self._agrupando += 1
+        try:
+            yield self
+        finally:
+            with self._lock_cambios:
+                self._agrupando -= 1
+                pendiente = not self._agrupando
+            if pendiente:
+                self.publicar_cambios()
 
     def listar_participantes(self):
         # Muestra los participantes actuales
-        if not self.observadores:
+        observadores = self.observadores
+        if not observadores:
             print("No hay participantes registrados.")
         else:
             print("👥 Participantes:")
-            for obs in self.observadores:
+            for obs in observadores:
                 print(f" - {obs.nombre}")
 
+# Calendario con muchos eventos
+# Mantiene un índice ordenado por fecha (general y por lugar) para consultas por
+# rango, un índice inverso participante -> eventos y un único registro de
+# participantes, de modo que una persona suscrita a muchos eventos es un solo objeto.
+# El calendario se suscribe a cada evento para mantener sus índices al día.
+def convertir_fecha(valor):
+    # Convierte "2025-04-10" (o una fecha/fecha y hora) en date; lanza ValueError si no es válida
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    texto = str(valor).strip()
+    try:
+        return date.fromisoformat(texto)
+    except ValueError:
+        return datetime.fromisoformat(texto).date()
+
+class Calendario(Observador):
+    def __init__(self):
+        self.eventos = {}  # id -> EventoCalendario
+        self.participantes = {}  # nombre -> Participante (registro compartido por todos los eventos)
+        self._siguiente_id = 1
+        self._ids = {}  # id(evento) -> id en el calendario
+        self._por_fecha = []  # Lista ordenada de (día ordinal, id)
+        self._por_lugar = {}  # lugar en minúsculas -> lista ordenada de (día ordinal, id)
+        self._indexado = {}  # id -> (día ordinal, lugar en minúsculas) con que está en los índices
+        self._eventos_de = {}  # nombre del participante -> conjunto de ids de eventos
+
+    # --- Eventos ---
+
+    def crear_evento(self, nombre, fecha, lugar):
+        # Crea un evento, lo indexa y devuelve su id
+        evento, clave = self._nuevo_evento(nombre, fecha, lugar)
+        bisect.insort(self._por_fecha, clave)
+        bisect.insort(self._por_lugar.setdefault(lugar.lower(), []), clave)
+        return clave[1]
+
+    def importar_eventos(self, filas):
+        # Crea muchos eventos (nombre, fecha, lugar) y ordena los índices una sola vez; devuelve sus ids
+        ids = []
+        for nombre, fecha, lugar in filas:
+            _, clave = self._nuevo_evento(nombre, fecha, lugar)
+            self._por_fecha.append(clave)
+            self._por_lugar.setdefault(lugar.lower(), []).append(clave)
+            ids.append(clave[1])
+        self._por_fecha.sort()
+        for indice in self._por_lugar.values():
+            indice.sort()
+        return ids
+
+    def _nuevo_evento(self, nombre, fecha, lugar):
+        dia = convertir_fecha(fecha).toordinal()
+        evento = EventoCalendario(nombre, fecha, lugar)
+        evento.validar_fecha = convertir_fecha  # Una fecha inválida no llega a cambiar el evento
+        evento.agregar_observador(self)  # Para mantener los índices al día cuando cambie
+        id_evento = self._siguiente_id
+        self._siguiente_id += 1
+        self.eventos[id_evento] = evento
+        self._ids[id(evento)] = id_evento
+        self._indexado[id_evento] = (dia, lugar.lower())
+        return evento, (dia, id_evento)
+
+    def eliminar_evento(self, id_evento):
+        evento = self.eventos.pop(id_evento)
+        del self._ids[id(evento)]
+        self._sacar_de_indices(id_evento)
+        for observador in evento.observadores:
+            if observador is not self:
+                self._eventos_de.get(observador.nombre, set()).discard(id_evento)
+
+    def _sacar_de_indices(self, id_evento):
+        # Usa la fecha y el lugar con que se indexó (no los del evento, que pueden haber cambiado)
+        dia, lugar = self._indexado.pop(id_evento)
+        clave = (dia, id_evento)
+        for indice in (self._por_fecha, self._por_lugar.get(lugar, [])):
+            posicion = bisect.bisect_left(indice, clave)
+            if posicion < len(indice) and indice[posicion] == clave:
+                del indice[posicion]
+
+    def actualizar(self, evento):
+        # Un evento cambió de fecha o lugar: se mueve en los índices (la fecha ya la validó el evento)
+        id_evento = self._ids.get(id(evento.evento))
+        if id_evento is None:
+            return
+        dia, lugar = convertir_fecha(evento.fecha).toordinal(), evento.lugar.lower()
+        if self._indexado[id_evento] == (dia, lugar):
+            return
+        self._sacar_de_indices(id_evento)
+        clave = (dia, id_evento)
+        bisect.insort(self._por_fecha, clave)
+        bisect.insort(self._por_lugar.setdefault(lugar, []), clave)
+        self._indexado[id_evento] = (dia, lugar)
+
+    # --- Consultas ---
+
+    def entre(self, desde, hasta, lugar=None):
+        # Eventos entre dos fechas (incluidas), ordenados por fecha; opcionalmente solo en un lugar
+        indice = self._por_fecha if lugar is None else self._por_lugar.get(lugar.lower(), [])
+        inicio = bisect.bisect_left(indice, (convertir_fecha(desde).toordinal(), 0))
+        fin = bisect.bisect_right(indice, (convertir_fecha(hasta).toordinal(), float("inf")))
+        return [self.eventos[id_evento] for _, id_evento in indice[inicio:fin]]
+
+    def semana(self, fecha, lugar=None):
+        # Eventos de la semana (lunes a domingo) que contiene la fecha indicada
+        dia = convertir_fecha(fecha)
+        lunes = dia - timedelta(days=dia.weekday())
+        return self.entre(lunes, lunes + timedelta(days=6), lugar)
+
+    # --- Participantes ---
+
+    def participante(self, nombre):
+        # Devuelve el participante con ese nombre, creándolo la primera vez
+        participante = self.participantes.get(nombre)
+        if participante is None:
+            participante = self.participantes[nombre] = Participante(nombre)
+        return participante
+
+    def suscribir(self, nombre, id_evento, campos=None):
+        participante = self.participante(nombre)
+        self.eventos[id_evento].agregar_observador(participante, campos)
+        self._eventos_de.setdefault(nombre, set()).add(id_evento)
+        return participante
+
+    def desuscribir(self, nombre, id_evento):
+        self.eventos[id_evento].quitar_observador(self.participantes[nombre])
+        self._eventos_de[nombre].discard(id_evento)
+
+    def eventos_de(self, nombre, desde=None, hasta=None):
+        # Eventos a los que está suscrito un participante, ordenados por fecha (opcionalmente en un rango)
+        # Usa el día con que está indexado cada evento, igual que entre()
+        eventos = [(self._indexado[i][0], i) for i in self._eventos_de.get(nombre, ())]
+        if desde is not None:
+            eventos = [(dia, i) for dia, i in eventos if dia >= convertir_fecha(desde).toordinal()]
+        if hasta is not None:
+            eventos = [(dia, i) for dia, i in eventos if dia <= convertir_fecha(hasta).toordinal()]
+        return [self.eventos[i] for _, i in sorted(eventos)]
+
+    def __len__(self):
+        return len(self.eventos)
+
+# Importación masiva de participantes
+# Lee un CSV (con columna 'nombre') o JSONL sin cargarlo entero en memoria, descarta
+# los nombres repetidos en la misma pasada y suscribe a los nuevos por bloques.
+def leer_participantes(archivo, formato="csv", campo="nombre"):
+    # Genera los nombres de los participantes de un archivo abierto
+    if formato == "csv":
+        for fila in csv.DictReader(archivo):
+            nombre = (fila.get(campo) or "").strip()
+            if nombre:
+                yield nombre
+    else:
+        for linea in archivo:
+            if linea.strip():
+                nombre = str(json.loads(linea).get(campo) or "").strip()
+                if nombre:
+                    yield nombre
+
+def importar_participantes(evento, entrada="-", formato="csv", campo="nombre", registro=None,
+                           tamano_bloque=10_000, medir_memoria=False):
+    # Importa los participantes de un archivo ("-" = stdin) al evento. 'registro' (nombre -> Participante)
+    # recibe a los importados; con referencias débiles es lo que los mantiene vivos (y es obligatorio).
+    # Devuelve un resumen.
+    if evento.referencias_debiles and registro is None:
+        raise ValueError("Con referencias débiles hace falta un 'registro' que mantenga vivos a los participantes")
+    vistos = set(registro) if registro is not None else set()
+    vistos.update(getattr(obs, "nombre", None) for obs in evento.observadores)
+    resumen = {"leidos": 0, "importados": 0, "duplicados": 0}
+
+    def nuevos(nombres):
+        for nombre in nombres:
+            resumen["leidos"] += 1
+            if nombre in vistos:
+                resumen["duplicados"] += 1
+                continue
+            vistos.add(nombre)
+            participante = Participante(nombre)
+            if registro is not None:
+                registro[nombre] = participante
+            resumen["importados"] += 1
+            yield participante
+
+    if medir_memoria:
+        import tracemalloc
+        tracemalloc.start()
+    inicio = time.perf_counter()
+    archivo = sys.stdin if entrada == "-" else open(entrada, "r", encoding="utf-8", newline="")
+    try:
+        evento.agregar_observadores(nuevos(leer_participantes(archivo, formato, campo)), tamano_bloque=tamano_bloque)
+    finally:
+        if entrada != "-":
+            archivo.close()
+    resumen["segundos"] = time.perf_counter() - inicio
+    resumen["por_segundo"] = resumen["leidos"] / resumen["segundos"] if resumen["segundos"] else 0.0
+    if medir_memoria:
+        del vistos  # Solo se usó para descartar repetidos: no cuenta como memoria de los participantes
+        resumen["bytes_por_participante"] = tracemalloc.get_traced_memory()[0] / max(resumen["importados"], 1)
+        tracemalloc.stop()
+    return resumen
+
 # Menú interactivo
 def menu():
     # Solicita los datos iniciales del evento
@@ -70,7 +846,8 @@ def menu():
         print("3. Cambiar fecha/lugar del evento")
         print("4. Ver participantes")
         print("5. Ver detalles del evento")
-        print("6. Salir")
+        print("6. Importar participantes (CSV/JSONL)")
+        print("7. Salir")
 
         opcion = input("Elige una opción: ")
 
@@ -112,13 +889,102 @@ def menu():
             print(f"📍 Lugar: {evento.lugar}")
 
         elif opcion == "6":
+            ruta = input("Archivo CSV o JSONL con los participantes: ").strip()
+            formato = "jsonl" if ruta.endswith((".jsonl", ".json")) else "csv"
+            try:
+                resumen = importar_participantes(evento, ruta, formato, registro=participantes)
+            except (OSError, ValueError, KeyError) as error:
+                print(f"⚠️ No se pudo importar: {error}")
+            else:
+                print(f"✅ {resumen['importados']} participantes añadidos "
+                      f"({resumen['duplicados']} repetidos, {resumen['por_segundo']:,.0f} filas/s).")
+
+        elif opcion == "7":
             print("¡Hasta luego!")  # Cierra el programa
             break
 
         else:
             print("Opción no válida.")  # Manejo de entradas no válidas
 
-# Ejecutar el menú
-menu()  # Se ejecuta el menú si se corre el script directamente
+# Benchmark de arranque
+# Mide en un intérprete nuevo lo que paga un proceso corto que solo quiere notificar:
+# el tiempo de importar el módulo y la latencia de la primera notificación.
+CODIGO_ARRANQUE = """
+import json, os, sys, time
+inicio = time.perf_counter()
+sys.path.insert(0, {carpeta!r})
+import PatrónObserver as observer
+importado = time.perf_counter()
+evento = observer.EventoCalendario("Evento", "2025-04-10", "Auditorio")
+for i in range({participantes}):
+    evento.agregar_observador(observer.Participante(f"Participante {{i}}"))
+listo = time.perf_counter()
+salida, sys.stdout = sys.stdout, open(os.devnull, "w", encoding="utf-8")
+evento.cambiar_evento("2025-04-12", None)
+notificado = time.perf_counter()
+sys.stdout = salida
+print(json.dumps({{"importacion_ms": (importado - inicio) * 1000, "preparacion_ms": (listo - importado) * 1000,
+                  "primera_notificacion_ms": (notificado - listo) * 1000}}))
+"""
+
+def benchmark_arranque(repeticiones=5, participantes=1000):
+    # Mediana de varias ejecuciones en procesos nuevos (así el módulo nunca está ya importado)
+    import statistics
+    import subprocess
+    codigo = CODIGO_ARRANQUE.format(carpeta=os.path.dirname(os.path.abspath(__file__)), participantes=participantes)
+    medidas = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        salida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True).stdout
+        medida = json.loads(salida)
+        medida["proceso_ms"] = (time.perf_counter() - inicio) * 1000  # Incluye el arranque de Python
+        medidas.append(medida)
+    resultado = {clave: statistics.median(m[clave] for m in medidas) for clave in medidas[0]}
+    print(f"\n--- Benchmark de arranque ({repeticiones} procesos, {participantes} participantes) ---")
+    for clave, valor in resultado.items():
+        print(f"{clave}: {valor:.2f}")
+    return resultado
+
+def benchmark_importacion(n=500_000, duplicados=0.05, tamano_bloque=10_000):
+    # Importa 'n' filas (con una fracción de nombres repetidos) desde un CSV temporal
+    import random
+    import tempfile
+    unicos = max(1, int(n * (1 - duplicados)))
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "participantes.csv")
+        with open(ruta, "w", encoding="utf-8", newline="") as archivo:
+            archivo.write("nombre\n")
+            archivo.writelines(f"Asistente {random.randrange(unicos) if i >= unicos else i}\n" for i in range(n))
+        evento = EventoCalendario("Conferencia", "2025-04-10", "Centro de convenciones")
+        resumen = importar_participantes(evento, ruta, tamano_bloque=tamano_bloque)
+        evento = EventoCalendario("Conferencia", "2025-04-10", "Centro de convenciones")
+        memoria = importar_participantes(evento, ruta, tamano_bloque=tamano_bloque, medir_memoria=True)
+    resumen["bytes_por_participante"] = memoria["bytes_por_participante"]
+    print(f"\n--- Benchmark de importación ({n} filas, bloques de {tamano_bloque}) ---")
+    print(f"{resumen['importados']} participantes nuevos, {resumen['duplicados']} repetidos | "
+          f"{resumen['segundos']:.2f} s | {resumen['por_segundo']:,.0f} filas/s | "
+          f"{resumen['bytes_por_participante']:.0f} bytes por participante")
+    return resumen
+
+# Ejecutar el menú solo si se corre el script directamente (importarlo no debe pedir datos)
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Calendario de eventos con el patrón Observer")
+    parser.add_argument("--benchmark-arranque", action="store_true",
+                        help="Mide el tiempo de importación y la latencia de la primera notificación")
+    parser.add_argument("--participantes", type=int, default=1000,
+                        help="Participantes suscritos en el benchmark de arranque")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Procesos medidos en el benchmark de arranque")
+    parser.add_argument("--benchmark-importacion", type=int, metavar="N",
+                        help="Mide la importación masiva de N participantes desde CSV")
+    parser.add_argument("--bloque", type=int, default=10_000, help="Participantes suscritos por bloque al importar")
+    args = parser.parse_args()
+
+    if args.benchmark_arranque:
+        benchmark_arranque(args.repeticiones, args.participantes)
+    elif args.benchmark_importacion:
+        benchmark_importacion(args.benchmark_importacion, tamano_bloque=args.bloque)
+    else:
+        menu()
 
 
@@ -1,11 +1,41 @@
+import argparse  # Se usa para el modo por lotes desde la línea de comandos
+import csv  # Se usa para leer y escribir pedidos en CSV
+import json  # Se usa para leer y escribir pedidos en JSONL
+import sys  # Se usa para leer de stdin y escribir en stdout
+from array import array  # Columnas compactas de enteros para el almacén de pedidos
+
+try:
+    import numpy as np  # Opcional: acelera el recálculo de precios por columnas
+except ImportError:
+    np = None
+
 # Clase base abstracta para todos los alimentos
 class Alimento:
+    __slots__ = ()  # Permite que PedidoCompilado no tenga __dict__; las demás clases hijas lo siguen teniendo
+
     def descripcion(self):
         pass  # Método que se sobreescribirá en las clases hijas
     
     def costo(self):
         pass  # Método que se sobreescribirá en las clases hijas
 
+    def linea(self):
+        return None  # Línea (tipo, nombre, precio) que aporta este elemento al pedido, si aporta alguna
+
+    def congelar(self):
+        # Recorre la cadena de decoradores una sola vez y devuelve un pedido compilado
+        lineas = []
+        actual = self
+        while True:
+            linea = actual.linea()
+            if linea is not None:
+                lineas.append(linea)
+            if not isinstance(actual, AdicionalDecorator):
+                break
+            actual = actual.alimento  # Baja al alimento envuelto sin recursión
+        lineas.reverse()  # Del plato principal hacia afuera, igual que la cadena
+        return PedidoCompilado(lineas)
+
 # Representa un plato principal, hereda de Alimento
 class PlatoPrincipal(Alimento):
     def __init__(self, nombre, precio):
@@ -18,6 +48,9 @@ class PlatoPrincipal(Alimento):
     def costo(self):
         return self.precio  # Retorna el precio base
 
+    def linea(self):
+        return ("Plato principal", self.nombre, self.precio)
+
 # Decorador base que permite añadir extras al alimento
 class AdicionalDecorator(Alimento):
     def __init__(self, alimento):
@@ -42,6 +75,9 @@ class PostreDecorator(AdicionalDecorator):
     def costo(self):
         return self.alimento.costo() + self.precio_postre  # Suma el precio del postre
 
+    def linea(self):
+        return ("Postre", self.nombre_postre, self.precio_postre)
+
 # Decorador para añadir bebidas al pedido
 class BebidaDecorator(AdicionalDecorator):
     def __init__(self, alimento, nombre_bebida, precio_bebida):
@@ -55,6 +91,9 @@ class BebidaDecorator(AdicionalDecorator):
     def costo(self):
         return self.alimento.costo() + self.precio_bebida  # Suma el precio de la bebida
 
+    def linea(self):
+        return ("Bebida", self.nombre_bebida, self.precio_bebida)
+
 # Decorador para añadir porciones extras al pedido
 class PorcionExtraDecorator(AdicionalDecorator):
     def __init__(self, alimento, extra, precio_extra):
@@ -68,6 +107,33 @@ class PorcionExtraDecorator(AdicionalDecorator):
     def costo(self):
         return self.alimento.costo() + self.precio_extra  # Suma el precio del extra
 
+    def linea(self):
+        return ("Extra", self.extra, self.precio_extra)
+
+# Pedido ya armado y "congelado": guarda el total, la descripción y las líneas
+# precalculadas, de modo que costo() y descripcion() no recorren la cadena de decoradores
+class PedidoCompilado(Alimento):
+    __slots__ = ("lineas", "_descripcion", "_costo")
+
+    def __init__(self, lineas):
+        self.lineas = tuple(lineas)  # Tuplas (tipo, nombre, precio) en el orden del pedido
+        partes = []
+        total = 0
+        for tipo, nombre, precio in self.lineas:
+            partes.append(f"{tipo}: {nombre}")
+            total = total + precio  # Mismo orden de suma que la cadena de decoradores
+        self._descripcion = " + ".join(partes)
+        self._costo = total
+
+    def descripcion(self):
+        return self._descripcion
+
+    def costo(self):
+        return self._costo
+
+    def congelar(self):
+        return self  # Ya está compilado
+
 # Clase que gestiona todo el menú del restaurante
 class MenuRestaurante:
     def __init__(self):
@@ -100,6 +166,8 @@ class MenuRestaurante:
             3: {"nombre": "Porción extra de queso", "precio": 1500},
             0: {"nombre": "Ninguno", "precio": 0}
         }
+
+        self._cotizaciones = {}  # Pedidos ya compilados, por combinación de ids
     
     # Muestra las opciones disponibles en un grupo (platos, postres, etc.)
     def mostrar_opciones(self, items, titulo):
@@ -148,9 +216,10 @@ class MenuRestaurante:
     
     # Muestra el resumen del pedido y lo confirma
     def confirmar_pedido(self, plato):
+        pedido = plato.congelar()  # Se compila una vez para mostrar el resumen
         print("\n--- RESUMEN DE SU PEDIDO ---")
-        print(plato.descripcion())
-        print(f"TOTAL: ${plato.costo():.2f}")
+        print(pedido.descripcion())
+        print(f"TOTAL: ${pedido.costo():.2f}")
         
         while True:
             confirmacion = input("\n¿Confirmar pedido? (S/N): ").upper()
@@ -175,20 +244,226 @@ class MenuRestaurante:
         else:
             print("\n❌ Pedido cancelado.\n")
 
+    # --- Pedidos sin interacción ---
+
+    # Convierte un id o una lista de ids en una tupla de ids (sin los 0, que significan "ninguno")
+    @staticmethod
+    def _normalizar_ids(valor):
+        if valor is None or valor == "":
+            return ()
+        if isinstance(valor, str):
+            valor = [v for v in valor.replace(",", ";").split(";") if v.strip()]
+        elif not isinstance(valor, (list, tuple)):
+            valor = [valor]
+        return tuple(int(v) for v in valor if int(v) != 0)
+
+    # Arma la cadena de decoradores de un pedido a partir de los ids del menú
+    def armar_pedido(self, plato, postre=0, bebida=0, extra=0):
+        plato = int(plato)
+        if plato not in self.platos_principales:
+            raise ValueError(f"Plato principal inválido: {plato}")
+        item = self.platos_principales[plato]
+        pedido = PlatoPrincipal(item["nombre"], item["precio"])
+        for ids, items, decorador_clase, tipo in (
+                (postre, self.postres, PostreDecorator, "postre"),
+                (bebida, self.bebidas, BebidaDecorator, "bebida"),
+                (extra, self.extras, PorcionExtraDecorator, "extra")):
+            for opcion in self._normalizar_ids(ids):
+                if opcion not in items:
+                    raise ValueError(f"Opción de {tipo} inválida: {opcion}")
+                pedido = decorador_clase(pedido, items[opcion]["nombre"], items[opcion]["precio"])
+        return pedido
+
+    # Devuelve el pedido ya compilado; los pedidos iguales se calculan una sola vez
+    def cotizar_pedido(self, plato, postre=0, bebida=0, extra=0):
+        # Primero se busca con los valores tal como llegan (p. ej. los textos de un CSV) para no normalizarlos
+        clave_original = (plato, postre, bebida, extra)
+        try:
+            return self._cotizaciones[clave_original]
+        except (KeyError, TypeError):  # TypeError: la clave contiene listas
+            pass
+        clave = (int(plato), self._normalizar_ids(postre), self._normalizar_ids(bebida),
+                 self._normalizar_ids(extra))
+        pedido = self._cotizaciones.get(clave)
+        if pedido is None:
+            pedido = self._cotizaciones[clave] = self.armar_pedido(*clave).congelar()
+        try:
+            self._cotizaciones[clave_original] = pedido
+        except TypeError:
+            pass
+        return pedido
+
+    # Cotiza muchos pedidos (diccionarios con las claves plato, postre, bebida y extra)
+    def cotizar_lote(self, pedidos):
+        for pedido in pedidos:
+            yield self.cotizar_pedido(pedido["plato"], pedido.get("postre", 0),
+                                      pedido.get("bebida", 0), pedido.get("extra", 0))
+
+    # Borra las cotizaciones guardadas (usar si se cambian los precios del menú)
+    def limpiar_cotizaciones(self):
+        self._cotizaciones.clear()
+
+# Lee pedidos de un archivo CSV o JSONL, uno por línea, sin cargarlo entero en memoria.
+# Una línea JSONL que no es un objeto JSON lanza ValueError con su número de línea
+def leer_pedidos(archivo, formato):
+    if formato == "csv":
+        yield from csv.DictReader(archivo)
+    else:
+        for numero, linea in enumerate(archivo, 1):
+            if linea.strip():
+                try:
+                    pedido = json.loads(linea)
+                except ValueError as error:
+                    raise ValueError(f"Línea {numero}: JSON inválido ({error})") from None
+                if not isinstance(pedido, dict):
+                    raise ValueError(f"Línea {numero}: se esperaba un objeto JSON")
+                yield pedido
+
+# Cotiza todos los pedidos de un archivo ("-" = stdin/stdout). Un pedido con un id desconocido
+# (o sin plato) no corta el proceso: sale con el motivo en el campo "error" y sin total.
+# Devuelve {"procesados": ..., "errores": ...}
+def cotizar_archivo(menu, entrada="-", salida="-", formato="csv"):
+    archivo_entrada = sys.stdin if entrada == "-" else open(entrada, "r", encoding="utf-8", newline="")
+    archivo_salida = sys.stdout if salida == "-" else open(salida, "w", encoding="utf-8", newline="",
+                                                           buffering=1 << 20)
+    resumen = {"procesados": 0, "errores": 0}
+    try:
+        pedidos = leer_pedidos(archivo_entrada, formato)
+        escritor = None
+        for pedido in pedidos:
+            try:
+                compilado = menu.cotizar_pedido(pedido["plato"], pedido.get("postre", 0),
+                                                pedido.get("bebida", 0), pedido.get("extra", 0))
+            except (KeyError, TypeError, ValueError) as error:
+                motivo = f"Falta el campo {error}" if isinstance(error, KeyError) else str(error)
+                pedido.update(total=None, descripcion=None, error=motivo)
+                resumen["errores"] += 1
+            else:
+                pedido["total"] = compilado.costo()
+                pedido["descripcion"] = compilado.descripcion()
+                if formato == "csv":
+                    pedido["error"] = ""  # Todas las filas del CSV tienen las mismas columnas
+            if formato == "csv":
+                if escritor is None:
+                    escritor = csv.DictWriter(archivo_salida, fieldnames=list(pedido))
+                    escritor.writeheader()
+                escritor.writerow(pedido)
+            else:
+                archivo_salida.write(json.dumps(pedido, ensure_ascii=False) + "\n")
+            resumen["procesados"] += 1
+        archivo_salida.flush()
+    finally:
+        if entrada != "-":
+            archivo_entrada.close()
+        if salida != "-":
+            archivo_salida.close()
+    return resumen
+
+# Almacén de pedidos por columnas
+# Guarda millones de pedidos como arreglos de ids (plato, postre, bebida, extra)
+# en lugar de objetos, y calcula los totales cruzando esos ids con arreglos de
+# precios armados desde los catálogos del menú. Con NumPy instalado cada cálculo
+# es una sola operación vectorizada; sin NumPy se usa un recorrido en Python.
+class AlmacenPedidos:
+    COLUMNAS = ("plato", "postre", "bebida", "extra")
+    CATALOGOS = {"plato": "platos_principales", "postre": "postres", "bebida": "bebidas", "extra": "extras"}
+
+    def __init__(self, menu):
+        self.menu = menu
+        self.columnas = {columna: array("i") for columna in self.COLUMNAS}  # Enteros de 32 bits
+
+    def __len__(self):
+        return len(self.columnas["plato"])
+
+    # Agrega un pedido (un id por categoría; 0 = ninguno)
+    def agregar(self, plato, postre=0, bebida=0, extra=0):
+        for columna, valor in zip(self.COLUMNAS, (plato, postre, bebida, extra)):
+            if valor not in self._catalogo(columna):
+                raise ValueError(f"Opción de {columna} inválida: {valor}")
+        for columna, valor in zip(self.COLUMNAS, (plato, postre, bebida, extra)):
+            self.columnas[columna].append(valor)
+
+    # Agrega muchos pedidos dados como tuplas (plato, postre, bebida, extra)
+    def extender(self, pedidos):
+        for pedido in pedidos:
+            self.agregar(*pedido)
+
+    def _catalogo(self, columna):
+        return getattr(self.menu, self.CATALOGOS[columna])
+
+    # Arreglo de precios indexado por id; 'cambios' = {id: precio nuevo} para simular otra lista de precios
+    def precios(self, columna, cambios=None):
+        catalogo = self._catalogo(columna)
+        precios = [0] * (max(catalogo) + 1)
+        for id_item, item in catalogo.items():
+            precios[id_item] = item["precio"]
+        for id_item, precio in (cambios or {}).items():
+            precios[id_item] = precio
+        return precios
+
+    # Totales de todos los pedidos como array("d") (con o sin NumPy), en el orden en que se agregaron;
+    # 'cambios' = {"bebida": {3: 4000}, ...} para repreciar sin tocar el menú
+    def totales(self, cambios=None):
+        cambios = cambios or {}
+        if np is not None:
+            resultado = array("d", bytes(8 * len(self)))  # NumPy escribe directamente sobre este arreglo
+            total = np.frombuffer(resultado, dtype=np.float64)
+            for columna in self.COLUMNAS:
+                ids = np.frombuffer(self.columnas[columna], dtype=np.int32)
+                total += np.asarray(self.precios(columna, cambios.get(columna)), dtype=np.float64)[ids]
+            return resultado
+        p_plato, p_postre, p_bebida, p_extra = (self.precios(columna, cambios.get(columna))
+                                                for columna in self.COLUMNAS)
+        return array("d", (p_plato[a] + p_postre[b] + p_bebida[c] + p_extra[d]
+                           for a, b, c, d in zip(*(self.columnas[columna] for columna in self.COLUMNAS))))
+
+    # Ingresos totales por ítem de cada categoría: {"bebida": {"Agua mineral": 1500.0, ...}, ...}
+    def ingresos_por_item(self, cambios=None):
+        cambios = cambios or {}
+        resumen = {}
+        for columna in self.COLUMNAS:
+            catalogo = self._catalogo(columna)
+            precios = self.precios(columna, cambios.get(columna))
+            if np is not None:
+                ids = np.frombuffer(self.columnas[columna], dtype=np.int32)
+                cantidades = np.bincount(ids, minlength=len(precios))
+            else:
+                cantidades = [0] * len(precios)
+                for id_item in self.columnas[columna]:
+                    cantidades[id_item] += 1
+            resumen[columna] = {item["nombre"]: float(cantidades[id_item] * precios[id_item])
+                                for id_item, item in catalogo.items() if id_item != 0}
+        return resumen
+
 # Punto de entrada del programa
 if __name__ == "__main__":
-    while True:
-        try:
-            menu = MenuRestaurante()
-            menu.realizar_pedido()
+    parser = argparse.ArgumentParser(description="Menú del restaurante con el patrón Decorator")
+    parser.add_argument("--pedidos", help="Archivo CSV/JSONL de pedidos a cotizar ('-' = stdin)")
+    parser.add_argument("--salida", default="-", help="Archivo de salida (por defecto stdout)")
+    parser.add_argument("--formato", choices=["csv", "jsonl"],
+                        help="Formato de los pedidos (por defecto se deduce de la extensión)")
+    args = parser.parse_args()
+
+    if args.pedidos:
+        formato = args.formato or ("jsonl" if args.pedidos.endswith((".jsonl", ".json")) else "csv")
+        resumen = cotizar_archivo(MenuRestaurante(), args.pedidos, args.salida, formato)
+        print(f"✅ {resumen['procesados'] - resumen['errores']} pedidos cotizados.", file=sys.stderr)
+        if resumen["errores"]:
+            print(f"⚠️ {resumen['errores']} pedidos con error (ver el campo 'error').", file=sys.stderr)
+            sys.exit(1)
+    else:
+        while True:
+            try:
+                menu = MenuRestaurante()
+                menu.realizar_pedido()
             
-            continuar = input("¿Desea hacer otro pedido? (S/N): ").upper()
-            if continuar != 'S':
-                print("¡Gracias por visitarnos! Hasta pronto.")
+                continuar = input("¿Desea hacer otro pedido? (S/N): ").upper()
+                if continuar != 'S':
+                    print("¡Gracias por visitarnos! Hasta pronto.")
+                    break
+            except KeyboardInterrupt:
+                print("\n\n❌ Programa interrumpido por el usuario.")
                 break
-        except KeyboardInterrupt:
-            print("\n\n❌ Programa interrumpido por el usuario.")
-            break
-        except Exception as e:
-            print(f"\n⚠️ Error inesperado: {e}")
-            print("Reiniciando el menú...\n")
+            except Exception as e:
+                print(f"\n⚠️ Error inesperado: {e}")
+                print("Reiniciando el menú...\n")
@@ -1,33 +1,650 @@
+import argparse  # Opciones de línea de comandos (prueba de concurrencia)
+import asyncio  # Versión asíncrona de la conexión y de las sesiones
+import contextlib  # Silencia los mensajes durante la prueba de concurrencia
+import os  # Ruta del archivo de la base de datos simulada
+import sqlite3  # Conexiones reales (SQLite local) del pool
+import tempfile  # Carpeta temporal donde vive la base de datos simulada
+import threading  # Sincronización del pool entre hilos
+import time  # Medición de tiempos de espera del pool
+import weakref  # Un semáforo por bucle de eventos, sin mantener vivos los bucles
+from bisect import bisect_left  # Ubica cada latencia en su rango del histograma
+from collections import OrderedDict, deque  # Caché LRU de sentencias y registro de consultas lentas
+from concurrent.futures import Future  # Resultado de cada escritura encolada
+from contextlib import asynccontextmanager, contextmanager  # Préstamo de conexiones con "with"
+
+
 class DatabaseConnection:
     _instance = None  # Instancia única compartida
+    _lock_instancia = threading.Lock()  # Evita que dos hilos creen la instancia a la vez
 
     def __new__(cls):
         # Método especial que se llama antes de __init__
+        # Doble verificación: el caso normal (ya existe) no toma el bloqueo
         if cls._instance is None:
-            print("🔧 Creando nueva instancia de conexión...")
-            cls._instance = super(DatabaseConnection, cls).__new__(cls)  # Crea la instancia
-            cls._instance._connected = False  # Inicializa el estado de conexión
+            with cls._lock_instancia:
+                if cls._instance is None:  # Otro hilo pudo crearla mientras se esperaba el bloqueo
+                    print("🔧 Creando nueva instancia de conexión...")
+                    instancia = super(DatabaseConnection, cls).__new__(cls)  # Crea la instancia
+                    instancia._connected = False  # Inicializa el estado de conexión
+                    instancia._pool = None  # El pool se crea al conectar (el arranque es barato)
+                    instancia._config_pool = {}  # Configuración del pool (ver configurar_pool)
+                    instancia._lock = threading.RLock()  # Protege connect/disconnect
+                    instancia._semaforos = weakref.WeakKeyDictionary()  # Bucle de eventos -> semáforo
+                    instancia._config_consultas = {}  # Ver configurar_consultas
+                    instancia._metricas = MetricasConsultas()
+                    instancia._escritor = None  # Escritor por lotes, se crea al conectar
+                    instancia._prestadas = {}  # Conexión -> pool que la prestó (ver obtener_conexion)
+                    cls._instance = instancia  # Se publica solo cuando ya está completa
         return cls._instance  # Retorna siempre la misma instancia
 
+    def configurar_pool(self, ruta=None, max_conexiones=10, min_inactivas=2, verificar_salud=True,
+                        cache_sentencias=128):
+        # Define cómo será el pool de conexiones; se aplica en el próximo connect()
+        with self._lock:
+            if self._connected:
+                raise RuntimeError("Desconecta antes de cambiar la configuración del pool")
+            self._config_pool = {"ruta": ruta, "max_conexiones": max_conexiones,
+                                 "min_inactivas": min_inactivas, "verificar_salud": verificar_salud,
+                                 "cache_sentencias": cache_sentencias}
+
+    def configurar_consultas(self, tamano_lote=500, intervalo_lote=0.05, umbral_lento_ms=100.0):
+        # Escrituras por lotes (se confirman al juntar 'tamano_lote' o tras 'intervalo_lote' segundos)
+        # y umbral a partir del cual una consulta se anota como lenta; se aplica en el próximo connect()
+        with self._lock:
+            if self._connected:
+                raise RuntimeError("Desconecta antes de cambiar la configuración de las consultas")
+            self._config_consultas = {"tamano_lote": tamano_lote, "intervalo_lote": intervalo_lote}
+            self._metricas.umbral_lento = umbral_lento_ms / 1000
+
     def connect(self):
-        # Simula conectar a la base de datos
-        if not self._connected:
-            print("🔌 Conectando a la base de datos (simulada)...")
-            self._connected = True
-        else:
-            print("⚠️ Ya estás conectado.")
+        # Conecta a la base de datos creando el pool de conexiones
+        with self._lock:
+            if not self._connected:
+                print("🔌 Conectando a la base de datos (simulada)...")
+                self._pool = PoolConexiones(**self._config_pool)
+                self._metricas.capacidad_sentencias = self._pool.cache_sentencias
+                self._escritor = EscritorPorLotes(self._pool, self._metricas, **self._config_consultas)
+                self._connected = True
+            else:
+                print("⚠️ Ya estás conectado.")
 
     def disconnect(self):
-        # Simula desconectar de la base de datos
-        if self._connected:
-            print("❌ Desconectando de la base de datos...")
-            self._connected = False
-        else:
-            print("⚠️ La conexión ya estaba cerrada.")
+        # Desconecta de la base de datos cerrando todas las conexiones del pool
+        with self._lock:
+            if self._connected:
+                print("❌ Desconectando de la base de datos...")
+                self._escritor.cerrar()  # Confirma las escrituras pendientes antes de cerrar
+                self._escritor = None
+                self._pool.cerrar()
+                self._pool = None
+                self._connected = False
+            else:
+                print("⚠️ La conexión ya estaba cerrada.")
+
+    async def connect_async(self):
+        # Igual que connect(), sin bloquear el bucle de eventos mientras se abren las conexiones
+        await asyncio.to_thread(self.connect)
+
+    async def disconnect_async(self):
+        await asyncio.to_thread(self.disconnect)
+
+    @asynccontextmanager
+    async def sesion(self, tiempo_limite=None):
+        # Uso: async with db.sesion() as con: ...
+        # Como mucho 'max_conexiones' corrutinas esperan a la vez en hilos; las demás esperan en el semáforo
+        pool = self._pool_activo()
+        bucle = asyncio.get_running_loop()
+        with self._lock:
+            semaforo = self._semaforos.get(bucle)
+            if semaforo is None:
+                semaforo = self._semaforos[bucle] = asyncio.Semaphore(pool.max_conexiones)
+        async with semaforo:
+            conexion = await self._obtener_async(pool, tiempo_limite)
+            try:
+                yield conexion
+            finally:
+                pool.devolver(conexion)
+
+    @staticmethod
+    async def _obtener_async(pool, tiempo_limite):
+        # Si la corrutina se cancela mientras el hilo espera, el hilo sigue y puede llegar a
+        # tomar una conexión: en ese caso la devuelve él mismo (o quien se entere primero)
+        traspaso = {"conexion": None, "cancelada": False}
+        lock = threading.Lock()
+
+        def obtener():
+            conexion = pool.obtener(tiempo_limite)
+            with lock:
+                if traspaso["cancelada"]:
+                    pool.devolver(conexion)
+                    return None
+                traspaso["conexion"] = conexion
+            return conexion
+
+        try:
+            return await asyncio.to_thread(obtener)
+        except asyncio.CancelledError:
+            with lock:
+                traspaso["cancelada"] = True
+                conexion, traspaso["conexion"] = traspaso["conexion"], None
+            if conexion is not None:  # El hilo ya la había tomado, pero no llegó a la corrutina
+                pool.devolver(conexion)
+            raise
+
+    def status(self, detallado=False):
+        # Retorna el estado actual de conexión; con detallado=True, un diccionario con las métricas
+        if not detallado:
+            return "✅ Conectado" if self._connected else "⛔ Desconectado"
+        return {"conectado": self._connected, "pool": self.estado_pool(), "consultas": self._metricas.resumen()}
+
+    def ejecutar(self, sql, parametros=()):
+        # Ejecuta una consulta en una conexión del pool y devuelve sus filas (se confirma al terminar)
+        pool = self._pool_activo()
+        self._metricas.usar_sentencia(sql)
+        inicio = time.perf_counter()
+        try:
+            with pool.conexion() as conexion:
+                with conexion:  # Confirma si todo salió bien, deshace si hubo error
+                    filas = conexion.execute(sql, parametros).fetchall()
+        except Exception:
+            self._metricas.registrar(sql, time.perf_counter() - inicio, error=True)
+            raise
+        self._metricas.registrar(sql, time.perf_counter() - inicio)
+        return filas
+
+    def escribir(self, sql, parametros=()):
+        # Encola una escritura pequeña; se ejecuta junto con otras en una sola transacción.
+        # Devuelve un Future: result() espera a que se confirme o lanza el error de esa escritura
+        escritor = self._escritor
+        if escritor is None:
+            raise RuntimeError("No hay conexión: llama primero a connect()")
+        self._metricas.usar_sentencia(sql)
+        return escritor.agregar(sql, parametros)
+
+    def vaciar(self):
+        # Confirma ya las escrituras encoladas con escribir()
+        escritor = self._escritor
+        if escritor is not None:
+            escritor.vaciar()
+
+    def _pool_activo(self):
+        pool = self._pool  # Se lee una sola vez por si otro hilo desconecta al mismo tiempo
+        if pool is None:
+            raise RuntimeError("No hay conexión: llama primero a connect()")
+        return pool
+
+    def obtener_conexion(self, tiempo_limite=None):
+        # Toma una conexión del pool (esperando si están todas en uso)
+        pool = self._pool_activo()
+        conexion = pool.obtener(tiempo_limite)
+        with self._lock:
+            self._prestadas[conexion] = pool
+        return conexion
+
+    def devolver_conexion(self, conexion):
+        # Devuelve una conexión tomada con obtener_conexion() al pool que la prestó, aunque
+        # entretanto se haya desconectado (ese pool ya cerrado la cierra) o reconectado
+        with self._lock:
+            pool = self._prestadas.pop(conexion, None)
+        if pool is None:
+            raise ValueError("La conexión no fue tomada con obtener_conexion() o ya fue devuelta")
+        pool.devolver(conexion)
+
+    def conexion(self, tiempo_limite=None):
+        # Uso: with db.conexion() as con: con.execute(...)
+        return self._pool_activo().conexion(tiempo_limite)
+
+    def estado_pool(self):
+        # Métricas del pool (vacío si no hay conexión)
+        pool = self._pool
+        return pool.metricas() if pool is not None else {}
+
+
+RUTA_DB_SIMULADA = os.path.join(tempfile.gettempdir(), "db_simulada.sqlite3")  # Base local por defecto
+
+
+# Pool de conexiones
+# Mantiene hasta 'max_conexiones' conexiones SQLite abiertas. Las conexiones libres
+# se reutilizan, se verifica que sigan sanas al entregarlas y se conservan al menos
+# 'min_inactivas' listas para usar. Si todas están en uso, quien pide espera.
+class PoolConexiones:
+    def __init__(self, ruta=None, max_conexiones=10, min_inactivas=2, verificar_salud=True,
+                 cache_sentencias=128):
+        if max_conexiones <= 0 or not 0 <= min_inactivas <= max_conexiones:
+            raise ValueError("Se requiere 0 <= min_inactivas <= max_conexiones y max_conexiones > 0")
+        self.ruta = ruta or RUTA_DB_SIMULADA
+        self.cache_sentencias = cache_sentencias  # Sentencias preparadas que guarda cada conexión (LRU de sqlite3)
+        self.max_conexiones = max_conexiones
+        self.min_inactivas = min_inactivas
+        self.verificar_salud = verificar_salud
+        self._inactivas = []  # Conexiones libres (se usa como pila: la última devuelta sale primero)
+        self._en_uso = set()
+        # Conexiones que se están abriendo o verificando fuera del bloqueo (cuentan para el máximo)
+        self._preparando = 0
+        self._reponiendo = 0  # De ellas, las que se abren para quedar libres
+        self._condicion = threading.Condition()
+        self._cerrado = False
+        # Métricas
+        self.entregas = 0
+        self.esperas = 0  # Entregas que tuvieron que esperar a que se liberara una conexión
+        self.tiempo_espera_total = 0.0
+        self.tiempo_espera_max = 0.0
+        self.expiradas = 0  # Pedidos que superaron el tiempo límite
+        self.descartadas = 0  # Conexiones que fallaron la verificación de salud
+        self._reponer()
+
+    def _crear(self):
+        # timeout: cuánto espera SQLite si otra conexión tiene la base bloqueada
+        conexion = sqlite3.connect(self.ruta, timeout=5.0, check_same_thread=False,
+                                   cached_statements=self.cache_sentencias)
+        conexion.execute("PRAGMA journal_mode=WAL")  # Lectores y un escritor a la vez sin bloquearse
+        return conexion
+
+    def _total(self):
+        return len(self._inactivas) + len(self._en_uso) + self._preparando
+
+    def _reponer(self):
+        # Crea conexiones hasta tener 'min_inactivas' libres sin pasar de 'max_conexiones'.
+        # Se abren sin el bloqueo tomado: abrir una conexión no frena a quien pide o devuelve otra
+        while True:
+            with self._condicion:
+                if (self._cerrado or len(self._inactivas) + self._reponiendo >= self.min_inactivas
+                        or self._total() >= self.max_conexiones):
+                    return
+                self._preparando += 1
+                self._reponiendo += 1
+            try:
+                conexion = self._crear()
+            finally:
+                with self._condicion:
+                    self._preparando -= 1
+                    self._reponiendo -= 1
+            with self._condicion:
+                if self._cerrado:
+                    conexion.close()
+                    return
+                self._inactivas.append(conexion)
+                self._condicion.notify()
+
+    def _sana(self, conexion):
+        try:
+            conexion.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def obtener(self, tiempo_limite=None):
+        # Entrega una conexión; lanza TimeoutError si no se libera ninguna a tiempo.
+        # La conexión se reserva con el bloqueo tomado, pero se abre o verifica sin él
+        inicio = time.perf_counter()
+        espero = False
+        while True:
+            with self._condicion:
+                while True:
+                    if self._cerrado:
+                        raise RuntimeError("El pool está cerrado")
+                    if self._inactivas:
+                        conexion, nueva = self._inactivas.pop(), False
+                        break
+                    if self._total() < self.max_conexiones:
+                        conexion, nueva = None, True
+                        break
+                    espero = True
+                    restante = None if tiempo_limite is None else tiempo_limite - (time.perf_counter() - inicio)
+                    if restante is not None and restante <= 0:
+                        self.expiradas += 1
+                        raise TimeoutError("No hay conexiones libres en el pool")
+                    self._condicion.wait(restante)
+                self._preparando += 1
+            try:
+                if nueva:
+                    conexion = self._crear()
+                    sana = True
+                else:
+                    sana = not self.verificar_salud or self._sana(conexion)
+                    if not sana:
+                        conexion.close()
+            except BaseException:
+                with self._condicion:
+                    self._preparando -= 1
+                    self._condicion.notify()
+                raise
+            with self._condicion:
+                self._preparando -= 1
+                if not sana:
+                    self.descartadas += 1
+                    self._condicion.notify()
+                    continue
+                if self._cerrado:
+                    conexion.close()
+                    raise RuntimeError("El pool está cerrado")
+                self._en_uso.add(conexion)
+                espera = time.perf_counter() - inicio
+                self.entregas += 1
+                self.esperas += espero
+                self.tiempo_espera_total += espera
+                self.tiempo_espera_max = max(self.tiempo_espera_max, espera)
+            break
+        try:
+            self._reponer()
+        except sqlite3.Error:
+            pass  # Reponer es opcional: la conexión pedida ya se entregó
+        return conexion
+
+    def devolver(self, conexion):
+        with self._condicion:
+            if conexion not in self._en_uso:
+                raise ValueError("La conexión no pertenece a este pool o ya fue devuelta")
+            self._en_uso.discard(conexion)
+            if self._cerrado:
+                conexion.close()
+                return
+            if conexion.in_transaction:
+                conexion.rollback()  # No se deja una transacción a medias para el siguiente
+            self._inactivas.append(conexion)
+            self._condicion.notify()
+
+    @contextmanager
+    def conexion(self, tiempo_limite=None):
+        # Presta una conexión durante un bloque "with" y la devuelve al salir
+        conexion = self.obtener(tiempo_limite)
+        try:
+            yield conexion
+        finally:
+            self.devolver(conexion)
 
-    def status(self):
-        # Retorna el estado actual de conexión
-        return "✅ Conectado" if self._connected else "⛔ Desconectado"
+    def metricas(self):
+        with self._condicion:
+            return {
+                "total": self._total(),
+                "en_uso": len(self._en_uso),
+                "inactivas": len(self._inactivas),
+                "max_conexiones": self.max_conexiones,
+                "min_inactivas": self.min_inactivas,
+                "entregas": self.entregas,
+                "esperas": self.esperas,
+                "espera_media_ms": self.tiempo_espera_total / self.entregas * 1000 if self.entregas else 0.0,
+                "espera_max_ms": self.tiempo_espera_max * 1000,
+                "expiradas": self.expiradas,
+                "descartadas": self.descartadas
+            }
+
+    def cerrar(self):
+        # Cierra las conexiones libres; las que están en uso se cierran al devolverse
+        with self._condicion:
+            self._cerrado = True
+            for conexion in self._inactivas:
+                conexion.close()
+            self._inactivas.clear()
+            self._condicion.notify_all()
+
+
+# Métricas de consultas
+# Histograma de latencias, contadores de rendimiento, registro de consultas lentas
+# y estadísticas de la caché de sentencias preparadas. sqlite3 ya guarda por
+# conexión un LRU de sentencias compiladas (cached_statements); aquí se lleva un LRU
+# equivalente por texto SQL para saber cuántas ejecuciones lo aprovechan.
+class MetricasConsultas:
+    LIMITES_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000)  # Límites superiores de cada rango del histograma
+
+    def __init__(self, umbral_lento_ms=100.0, capacidad_sentencias=128, max_lentas=100):
+        self.umbral_lento = umbral_lento_ms / 1000
+        self.capacidad_sentencias = capacidad_sentencias
+        self._lock = threading.Lock()
+        self._sentencias = OrderedDict()  # Texto SQL -> cantidad de usos, del menos al más reciente
+        self.lentas = deque(maxlen=max_lentas)  # (momento, milisegundos, SQL)
+        self.reiniciar()
+
+    def reiniciar(self):
+        with self._lock:
+            self.histograma = [0] * (len(self.LIMITES_MS) + 1)
+            self.consultas = 0
+            self.errores = 0
+            self.tiempo_total = 0.0
+            self.lotes = 0
+            self.filas_escritas = 0
+            self.aciertos_sentencias = 0
+            self.fallos_sentencias = 0
+            self._sentencias.clear()
+            self.lentas.clear()
+            self._inicio = time.monotonic()
+
+    def usar_sentencia(self, sql):
+        with self._lock:
+            if sql in self._sentencias:
+                self._sentencias.move_to_end(sql)
+                self.aciertos_sentencias += 1
+            else:
+                self.fallos_sentencias += 1
+                self._sentencias[sql] = True
+                if len(self._sentencias) > self.capacidad_sentencias:
+                    self._sentencias.popitem(last=False)
+
+    def registrar(self, sql, segundos, error=False, filas=0):
+        milisegundos = segundos * 1000
+        with self._lock:
+            self.consultas += 1
+            self.errores += error
+            self.tiempo_total += segundos
+            self.filas_escritas += filas
+            self.histograma[bisect_left(self.LIMITES_MS, milisegundos)] += 1
+            if segundos >= self.umbral_lento:
+                self.lentas.append((time.time(), milisegundos, sql))
+
+    def registrar_lote(self, segundos, filas, error=False, fallidas=0):
+        # 'fallidas': escrituras del lote rechazadas una por una (el resto sí se confirmó)
+        with self._lock:
+            self.lotes += 1
+            self.errores += fallidas
+        self.registrar(f"<lote de {filas} escrituras>", segundos, error, 0 if error else filas - fallidas)
+
+    def resumen(self):
+        with self._lock:
+            duracion = max(time.monotonic() - self._inicio, 1e-9)
+            etiquetas = [f"<={limite}ms" for limite in self.LIMITES_MS] + [f">{self.LIMITES_MS[-1]}ms"]
+            usos = self.aciertos_sentencias + self.fallos_sentencias
+            return {
+                "consultas": self.consultas,
+                "errores": self.errores,
+                "consultas_por_segundo": self.consultas / duracion,
+                "lotes": self.lotes,
+                "filas_escritas": self.filas_escritas,
+                "filas_por_segundo": self.filas_escritas / duracion,
+                "latencia_media_ms": self.tiempo_total / self.consultas * 1000 if self.consultas else 0.0,
+                "histograma_ms": dict(zip(etiquetas, self.histograma)),
+                "cache_sentencias": {"tamano": len(self._sentencias), "capacidad": self.capacidad_sentencias,
+                                     "tasa_aciertos": self.aciertos_sentencias / usos if usos else 0.0},
+                "consultas_lentas": list(self.lentas)
+            }
+
+
+# Escritor por lotes
+# Junta escrituras pequeñas y las confirma juntas en una transacción (group commit)
+# con executemany, cuando se acumulan 'tamano_lote' o pasan 'intervalo_lote' segundos
+# desde la primera pendiente. Se respeta el orden: las escrituras seguidas con el
+# mismo SQL forman un solo executemany. Si una escritura falla, el lote se repite
+# fila por fila (con un SAVEPOINT por fila) para confirmar las demás; el error llega
+# solo al Future de la escritura que falló. Si no se puede escribir nada (p. ej. la
+# base está bloqueada), el lote vuelve a la cola y se reintenta.
+class EscritorPorLotes:
+    def __init__(self, pool, metricas, tamano_lote=500, intervalo_lote=0.05, max_fallidas=100):
+        self.pool = pool
+        self.metricas = metricas
+        self.tamano_lote = tamano_lote
+        self.intervalo_lote = intervalo_lote
+        self._lock = threading.Lock()
+        self._pendientes = []  # Lista de [sql, lista de parámetros, lista de Futures]
+        self._cantidad = 0
+        self._primera = None  # Momento de la primera escritura pendiente
+        self._cerrado = False
+        self.ultimo_error = None  # Error del último vaciado automático que no pudo escribir el lote
+        self.fallidas = deque(maxlen=max_fallidas)  # Últimas (sql, parámetros, excepción) rechazadas
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._vaciar_periodicamente, daemon=True)
+        self._hilo.start()
+
+    def agregar(self, sql, parametros):
+        futuro = Future()
+        with self._lock:
+            if self._cerrado:
+                raise RuntimeError("El escritor por lotes está cerrado")
+            if self._pendientes and self._pendientes[-1][0] == sql:
+                self._pendientes[-1][1].append(parametros)
+                self._pendientes[-1][2].append(futuro)
+            else:
+                self._pendientes.append([sql, [parametros], [futuro]])
+            self._cantidad += 1
+            if self._primera is None:
+                self._primera = time.monotonic()
+            if self._cantidad >= self.tamano_lote:
+                try:
+                    self._vaciar()
+                except Exception as error:  # El lote sigue en la cola; no es un error de esta escritura
+                    self.ultimo_error = error
+        return futuro
+
+    def vaciar(self):
+        # Lanza la excepción si el lote no se pudo escribir (en ese caso sigue en la cola)
+        with self._lock:
+            self._vaciar()
+
+    def _vaciar(self):
+        # Se llama con el bloqueo tomado: quien escribe mientras tanto espera (así se agrupan)
+        if not self._pendientes:
+            return
+        pendientes, cantidad = self._pendientes, self._cantidad
+        self._pendientes, self._cantidad, self._primera = [], 0, None
+        inicio = time.perf_counter()
+        try:
+            fallos = self._escribir(pendientes)
+        except Exception:
+            # Nada quedó confirmado: el lote vuelve al principio de la cola, en el mismo orden
+            self._pendientes = pendientes + self._pendientes
+            self._cantidad += cantidad
+            self._primera = time.monotonic()
+            self.metricas.registrar_lote(time.perf_counter() - inicio, cantidad, error=True)
+            raise
+        self.metricas.registrar_lote(time.perf_counter() - inicio, cantidad, fallidas=len(fallos))
+        fallidos = {id(futuro): error for futuro, error in fallos}
+        for sql, filas, futuros in pendientes:
+            for parametros, futuro in zip(filas, futuros):
+                error = fallidos.get(id(futuro))
+                if error is None:
+                    futuro.set_result(None)
+                else:
+                    self.fallidas.append((sql, parametros, error))
+                    futuro.set_exception(error)
+
+    def _escribir(self, pendientes):
+        # Devuelve las (Future, excepción) de las escrituras rechazadas; lanza si no se confirmó nada
+        with self.pool.conexion() as conexion:
+            try:
+                with conexion:  # Una sola transacción para todo el lote
+                    for sql, filas, _ in pendientes:
+                        conexion.executemany(sql, filas)
+                return []
+            except sqlite3.Error as error:
+                if self._transitorio(error):
+                    raise
+                # Se deshizo todo el lote: se repite fila por fila para aislar las que fallan
+            fallos = []
+            with conexion:
+                conexion.execute("BEGIN")
+                for sql, filas, futuros in pendientes:
+                    for parametros, futuro in zip(filas, futuros):
+                        conexion.execute("SAVEPOINT fila")
+                        try:
+                            conexion.execute(sql, parametros)
+                        except sqlite3.Error as error:
+                            if self._transitorio(error):
+                                raise
+                            conexion.execute("ROLLBACK TO fila")
+                            fallos.append((futuro, error))
+                        conexion.execute("RELEASE fila")
+            return fallos
+
+    @staticmethod
+    def _transitorio(error):
+        # Base ocupada o bloqueada (SQLITE_BUSY / SQLITE_LOCKED): no es culpa de la escritura, se reintenta
+        return getattr(error, "sqlite_errorcode", 0) & 0xFF in (5, 6)
+
+    def _vaciar_periodicamente(self):
+        while not self._detener.wait(self.intervalo_lote):
+            with self._lock:
+                if self._primera is not None and time.monotonic() - self._primera >= self.intervalo_lote:
+                    try:
+                        self._vaciar()
+                    except Exception as error:  # El hilo no debe morir; el lote se reintenta en el próximo ciclo
+                        self.ultimo_error = error
+
+    def cerrar(self):
+        # Confirma lo pendiente y detiene el hilo; si no se pudo confirmar, lanza y el escritor sigue activo
+        with self._lock:
+            self._vaciar()
+            self._cerrado = True
+            self._detener.set()
+        self._hilo.join()
+
+
+# Prueba de concurrencia
+# Comprueba bajo contención que solo se crea una instancia, que connect/disconnect
+# dejan siempre un estado coherente y que muchas corrutinas comparten el pool.
+def prueba_concurrencia(hilos=64, corrutinas=2000):
+    class ConexionDePrueba(DatabaseConnection):
+        _instance = None  # Singleton propio para no tocar la instancia real
+
+    barrera = threading.Barrier(hilos)
+    instancias = []
+
+    def crear():
+        barrera.wait()  # Todos los hilos piden la instancia al mismo tiempo
+        instancias.append(ConexionDePrueba())
+
+    with contextlib.redirect_stdout(None):
+        trabajadores = [threading.Thread(target=crear) for _ in range(hilos)]
+        for trabajador in trabajadores:
+            trabajador.start()
+        for trabajador in trabajadores:
+            trabajador.join()
+    unicas = len({id(instancia) for instancia in instancias})
+    print(f"Instancias creadas por {hilos} hilos a la vez: {unicas}")
+
+    db = instancias[0]
+    db.configurar_pool(ruta=os.path.join(tempfile.gettempdir(), "db_prueba_concurrencia.sqlite3"))
+
+    def alternar(i):
+        for _ in range(20):
+            if i % 2:
+                db.connect()
+            else:
+                db.disconnect()
+
+    with contextlib.redirect_stdout(None):
+        trabajadores = [threading.Thread(target=alternar, args=(i,)) for i in range(hilos)]
+        for trabajador in trabajadores:
+            trabajador.start()
+        for trabajador in trabajadores:
+            trabajador.join()
+    coherente = db._connected == (db._pool is not None)
+    print(f"Estado coherente tras connect/disconnect concurrentes: {'sí' if coherente else 'NO'}")
+
+    async def consultas():
+        await db.connect_async()
+
+        async def consulta():
+            async with db.sesion() as conexion:
+                return conexion.execute("SELECT 1").fetchone()[0]
+
+        resultados = await asyncio.gather(*(consulta() for _ in range(corrutinas)))
+        await db.disconnect_async()
+        return sum(resultados)
+
+    with contextlib.redirect_stdout(None):
+        if db._connected:
+            db.disconnect()
+        total = asyncio.run(consultas())
+    print(f"Consultas completadas por {corrutinas} corrutinas: {total}")
+    return unicas == 1 and coherente and total == corrutinas
 
 
 # Función que muestra el menú de opciones
@@ -36,16 +653,24 @@ def mostrar_menu():
     print("1. Conectar a la base de datos")
     print("2. Desconectar de la base de datos")
     print("3. Ver estado de la conexión")
-    print("4. Salir")
+    print("4. Ver métricas del pool y de las consultas")
+    print("5. Salir")
 
 
 # Punto de entrada del programa
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Conexión a base de datos con el patrón Singleton")
+    parser.add_argument("--prueba-concurrencia", action="store_true",
+                        help="Ejecuta la prueba de concurrencia y termina")
+    args = parser.parse_args()
+    if args.prueba_concurrencia:
+        raise SystemExit(0 if prueba_concurrencia() else 1)
+
     db = DatabaseConnection()  # Obtiene la instancia única
 
     while True:
         mostrar_menu()
-        opcion = input("Elige una opción (1-4): ")
+        opcion = input("Elige una opción (1-5): ")
 
         if opcion == "1":
             db.connect()  # Intenta conectar
@@ -54,8 +679,15 @@ if __name__ == "__main__":
         elif opcion == "3":
             print("🔍 Estado actual:", db.status())  # Muestra estado de conexión
         elif opcion == "4":
+            estado = db.status(detallado=True)
+            if not estado["conectado"]:
+                print("⚠️ No hay pool activo. Conéctate primero.")
+            for seccion in ("pool", "consultas"):
+                print(f"📊 {seccion.capitalize()}:")
+                for clave, valor in estado[seccion].items():
+                    print(f"   {clave}: {valor:.3f}" if isinstance(valor, float) else f"   {clave}: {valor}")
+        elif opcion == "5":
             print("👋 Saliendo del programa...")  # Sale del programa
             break
         else:
             print("❗ Opción no válida. Por favor intenta de nuevo.")  # Opción inválida
-